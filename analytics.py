@@ -0,0 +1,252 @@
+import logging
+import os
+import threading
+
+import pandas as pd
+from sqlalchemy import Date, Float, Integer, func, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.sql.util import find_tables
+
+from db import engine, metadata, project_snapshots_table, users_table
+
+# Optional columnar mirror for the read-heavy portfolio pages. With BT_ANALYTICS_DB set to
+# a file path (and the duckdb package installed) the tables below are copied into an
+# embedded DuckDB database, and the portfolio-wide scans and aggregates (dashboard,
+# visualizations, portfolio tracking, reporting, rollups) read from there instead of the
+# SQLite file that takes the form writes.
+#
+# Rows are only ever appended, so each table is synced by watermark: the mirror remembers
+# the highest id and row count it has copied, and once SQLite's max(id) moves past it the
+# rows above that id are fetched. A row count that no longer adds up (rows were deleted,
+# e.g. a replaced cash-flow series, which also inserts the new one) recopies that one
+# table. Syncing happens right before a mirrored query runs, so results are as fresh as a
+# direct read. The mirror is only a cache: deleting the file is safe, and without
+# BT_ANALYTICS_DB, or if DuckDB can't be loaded, queries go to SQLite.
+
+MIRROR_PATH = os.environ.get("BT_ANALYTICS_DB")
+
+# Rows copied from SQLite per round trip while syncing
+SYNC_CHUNKSIZE = 50000
+
+# Tables with an id to sync by. users stays out of the mirror; project_summary and
+# project_snapshots are updated in place, and are already cheap to read through their keys.
+MIRROR_TABLES = [
+    table for table in metadata.sorted_tables
+    if 'id' in table.c and table not in (users_table, project_snapshots_table)
+]
+
+logger = logging.getLogger(__name__)
+
+_mirrors = {}
+_mirrors_lock = threading.Lock()
+_unavailable = set()
+
+
+# Column type -> (Arrow type, DuckDB type), for the mirror and the Parquet export;
+# anything else is stored as text
+COLUMN_TYPES = [
+    (Integer, 'int64', 'BIGINT'),
+    (Float, 'float64', 'DOUBLE'),
+    (Date, 'date32', 'DATE'),
+]
+
+
+def _column_types(column):
+    for sql_type, arrow_name, duckdb_name in COLUMN_TYPES:
+        if isinstance(column.type, sql_type):
+            return arrow_name, duckdb_name
+    return 'string', 'VARCHAR'
+
+
+def _duckdb_type(column):
+    return _column_types(column)[1]
+
+
+def arrow_type(column):
+    import pyarrow as pa
+
+    return getattr(pa, _column_types(column)[0])()
+
+
+class AnalyticsMirror:
+    def __init__(self, path, bind=engine):
+        import duckdb
+
+        self.path = path
+        self.bind = bind
+        self.rows_copied = 0
+        self.reloads = 0
+        self._connection = duckdb.connect(path)
+        self._lock = threading.Lock()
+        self._checked = set()
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS _sync_state (table_name VARCHAR PRIMARY KEY, max_id BIGINT, row_count BIGINT)"
+        )
+        # table name -> (max id, row count) copied so far, kept in memory so the per-read
+        # freshness check costs one SQLite probe and no DuckDB query
+        self._state = {
+            name: (max_id, row_count)
+            for name, max_id, row_count in self._connection.execute("SELECT * FROM _sync_state").fetchall()
+        }
+
+    # Create the mirror table, or recreate it when the SQLite table's columns have changed
+    def _ensure_table(self, table):
+        columns = [row[0] for row in self._connection.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = ? ORDER BY ordinal_position", [table.name]
+        ).fetchall()]
+        if columns != [column.name for column in table.columns]:
+            definition = ", ".join(f'"{column.name}" {_duckdb_type(column)}' for column in table.columns)
+            self._connection.execute(f'DROP TABLE IF EXISTS "{table.name}"')
+            self._connection.execute(f'CREATE TABLE "{table.name}" ({definition})')
+            self._connection.execute("DELETE FROM _sync_state WHERE table_name = ?", [table.name])
+            self._state.pop(table.name, None)
+        self._checked.add(table.name)
+
+    def _append(self, table, rows):
+        import pyarrow as pa
+
+        values = list(zip(*rows))
+        chunk = pa.table([pa.array(values[position], type=arrow_type(column)) for position, column in enumerate(table.columns)],
+                         names=[column.name for column in table.columns])
+        self._connection.register('_sync_chunk', chunk)
+        try:
+            self._connection.execute(f'INSERT INTO "{table.name}" SELECT * FROM _sync_chunk')
+        finally:
+            self._connection.unregister('_sync_chunk')
+        self.rows_copied += len(rows)
+
+    def _sync_table(self, table):
+        if table.name not in self._checked:
+            self._ensure_table(table)
+        state = self._state.get(table.name)
+        mirrored_max, mirrored_count = state or (None, 0)
+        with self.bind.connect() as conn:
+            # max(id) is a single index probe, unlike count(*); the count is only taken once
+            # the table has new rows
+            max_id = conn.execute(select(func.max(table.c.id))).scalar()
+            if state is not None and max_id == mirrored_max:
+                return
+            count = conn.execute(select(func.count()).select_from(table).where(table.c.id <= (max_id or 0))).scalar()
+            # Rows inserted after the count was taken have higher ids and wait for the next sync
+            query = select(table).where(table.c.id <= (max_id or 0))
+            reload = True
+            if mirrored_max is not None and max_id is not None:
+                new_rows = conn.execute(
+                    select(func.count()).select_from(table).where(table.c.id > mirrored_max, table.c.id <= max_id)
+                ).scalar()
+                reload = mirrored_count + new_rows != count
+                if not reload:
+                    query = query.where(table.c.id > mirrored_max)
+
+            self._connection.begin()
+            try:
+                copied = 0
+                if reload:
+                    self.reloads += 1
+                    self._connection.execute(f'DELETE FROM "{table.name}"')
+                if max_id is not None:
+                    result = conn.execution_options(yield_per=SYNC_CHUNKSIZE).execute(query.order_by(table.c.id))
+                    for rows in result.partitions():
+                        self._append(table, rows)
+                        copied += len(rows)
+                state = (max_id, copied if reload else mirrored_count + copied)
+                self._connection.execute("INSERT OR REPLACE INTO _sync_state VALUES (?, ?, ?)", [table.name, *state])
+                self._connection.commit()
+            except Exception:
+                self._connection.rollback()
+                raise
+            self._state[table.name] = state
+
+    # Bring the given tables up to date with SQLite
+    def sync(self, tables=MIRROR_TABLES):
+        with self._lock:
+            for table in tables:
+                self._sync_table(table)
+
+    def _execute(self, query, fetch):
+        tables = find_tables(query, include_joins=True)
+        self.sync([table for table in MIRROR_TABLES if table in tables])
+        # The SQLite rendering with inlined parameters is plain enough SQL for DuckDB
+        statement = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={'literal_binds': True}))
+        cursor = self._connection.cursor()
+        try:
+            return fetch(cursor.execute(statement))
+        finally:
+            cursor.close()
+
+    def fetch_all(self, query):
+        return self._execute(query, lambda result: result.fetchall())
+
+    # Results come back column by column, without building a Python tuple per row
+    def fetch_frame(self, query):
+        return self._execute(query, lambda result: result.df())
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+# Mirror bind into the DuckDB file at path; later analytics reads against bind use it
+def attach(bind, path):
+    with _mirrors_lock:
+        mirror = _mirrors.get(bind)
+        if mirror is None or mirror.path != path:
+            mirror = _mirrors[bind] = AnalyticsMirror(path, bind)
+        return mirror
+
+
+def detach(bind):
+    with _mirrors_lock:
+        mirror = _mirrors.pop(bind, None)
+    if mirror is not None:
+        mirror.close()
+
+
+def mirror_for(bind=engine):
+    with _mirrors_lock:
+        mirror = _mirrors.get(bind)
+        if mirror is not None or bind is not engine or not MIRROR_PATH or MIRROR_PATH in _unavailable:
+            return mirror
+        try:
+            mirror = _mirrors[bind] = AnalyticsMirror(MIRROR_PATH, bind)
+        except Exception:
+            # Not installed, or the file is held by another server process
+            logger.exception("Analytics mirror at %s is unavailable; reading from the main database", MIRROR_PATH)
+            _unavailable.add(MIRROR_PATH)
+        return mirror
+
+
+# Rows of a read-only query, from the mirror when there is one. Only tables in
+# MIRROR_TABLES may appear in the query.
+def fetch_all(query, bind=engine):
+    mirror = mirror_for(bind)
+    if mirror is not None:
+        try:
+            return mirror.fetch_all(query)
+        except Exception:
+            logger.exception("Analytics mirror query failed; reading from the main database")
+    with bind.connect() as conn:
+        return conn.execute(query).fetchall()
+
+
+# Query results as a DataFrame with the given column names, from the mirror when there
+# is one. Dates come back as datetime64 from the mirror and as date objects from SQLite,
+# so callers convert them with pd.to_datetime either way.
+def fetch_frame(query, columns, bind=engine):
+    mirror = mirror_for(bind)
+    if mirror is not None:
+        try:
+            frame = mirror.fetch_frame(query)
+        except Exception:
+            logger.exception("Analytics mirror query failed; reading from the main database")
+        else:
+            frame.columns = columns
+            return frame
+    with bind.connect() as conn:
+        return pd.DataFrame(conn.execute(query).fetchall(), columns=columns)
+
+
+# Dates from either source (date objects, datetime64, strings or None) as a
+# datetime64[D] array, NaT where missing
+def to_days(dates):
+    return pd.to_datetime(pd.Series(dates, dtype=object)).to_numpy().astype('datetime64[D]')
@@ -0,0 +1,470 @@
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+import analytics
+import capacity
+import figure_cache
+import history
+import paging
+import portfolio_roi
+import report_export
+import risk_exposure
+import rollup
+import schedule
+import search
+import summary
+from db import (
+    make_engine, init_schema, projects_table, tasks_table, task_dependencies_table, risks_table,
+    budget_table, resources_table, issues_table, milestones_table, costs_table, todos_table,
+    cash_flows_table, project_snapshots_table
+)
+
+# Headless performance benchmark. Synthetic portfolios of each requested size are
+# generated into their own SQLite databases (same schema as jayjay_bt_app.db, which is
+# never touched), then the data-loading and figure-building code behind each page is
+# timed directly, without Streamlit, with every application cache cleared between runs.
+#
+#   python benchmark.py --sizes 100 10000 --output results.json
+#   python benchmark.py --sizes 100 10000 --baseline results.json --report bench_output.txt
+#   python benchmark.py --sizes 100 10000 --mirror    (analytics reads from a DuckDB mirror)
+
+DEFAULT_SIZES = [100, 10000, 100000]
+DEFAULT_WORKDIR = "bench_data"
+DEFAULT_REPEAT = 3
+# A case counts as a regression when it is this much slower than the baseline...
+REGRESSION_RATIO = 0.2
+# ...and at least this many milliseconds slower, so tiny timings don't flap
+REGRESSION_MIN_MS = 5.0
+
+# Child rows generated per project
+ROWS_PER_PROJECT = {
+    'tasks': 10,
+    'risks': 3,
+    'budget': 3,
+    'issues': 3,
+    'resources': 2,
+    'costs': 2,
+    'milestones': 2,
+    'todos': 2,
+    'cash_flows': 6,
+}
+# Days on which each project's tracked levels change, spread over HISTORY_DAYS from FIRST_START
+SNAPSHOTS_PER_PROJECT = 24
+HISTORY_DAYS = 3 * 365
+# Chance that a task depends on the task before it in the same project
+DEPENDENCY_PROBABILITY = 0.7
+# Projects generated and inserted per transaction
+GENERATE_CHUNK = 5000
+
+STATUSES = ["Not Started", "In Progress", "Completed"]
+PRIORITIES = ["High", "Medium", "Low"]
+PORTFOLIOS = ["Turnaround project", "Special project", "Digitisation and automation"]
+RISK_STATUSES = ["Open", "Mitigated", "Closed"]
+ISSUE_STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+COST_STATUSES = ["On Track", "Over Budget", "Under Budget"]
+BUDGET_CATEGORIES = ["Labour", "Software", "Hardware", "Consulting", "Training"]
+ALLOCATIONS = [10, 20, 25, 50, 75, 100]
+FIRST_START = datetime.date(2023, 1, 1)
+
+
+def _dates(offsets):
+    return [FIRST_START + datetime.timedelta(days=int(offset)) for offset in offsets]
+
+
+def _pick(rng, options, size):
+    return np.array(options)[rng.integers(0, len(options), size)].tolist()
+
+
+def _records(**columns):
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def _generate_chunk(conn, rng, first, count, people):
+    numbers = np.arange(first, first + count)
+    names = [f"Project {number:06d}" for number in numbers]
+    start = rng.integers(0, 3 * 365, count)
+    duration = rng.integers(30, 720, count)
+    budget = rng.uniform(1e4, 5e6, count).round(2)
+    first_project_id = conn.execute(select(func.coalesce(func.max(projects_table.c.id), 0))).scalar() + 1
+    conn.execute(projects_table.insert(), _records(
+        name=names,
+        start_date=_dates(start),
+        end_date=_dates(start + duration),
+        budget=budget,
+        spent=(budget * rng.uniform(0, 1.2, count)).round(2),
+        status=_pick(rng, STATUSES, count),
+        portfolio=_pick(rng, PORTFOLIOS, count),
+        impact=rng.integers(0, 100, count).astype(float),
+        deliverable=[f"Deliverable {number}" for number in numbers],
+        timeline=[f"{days} days" for days in duration],
+    ))
+
+    # Like the tasks below, the projects just inserted have consecutive ids
+    project_ids = np.arange(first_project_id, first_project_id + count)
+
+    def children(table_name):
+        per_project = ROWS_PER_PROJECT[table_name]
+        owner = np.repeat(np.arange(count), per_project)
+        return owner, project_ids[owner].tolist()
+
+    owner, owner_ids = children('tasks')
+    rows = len(owner)
+    task_start = start[owner] + (rng.uniform(0, 0.9, rows) * duration[owner]).astype(int)
+    task_end = np.minimum(task_start + rng.integers(1, 60, rows), start[owner] + duration[owner])
+    first_task_id = conn.execute(select(func.coalesce(func.max(tasks_table.c.id), 0))).scalar() + 1
+    conn.execute(tasks_table.insert(), _records(
+        project_id=owner_ids,
+        task=[f"Task {index % ROWS_PER_PROJECT['tasks'] + 1}" for index in range(rows)],
+        priority=_pick(rng, PRIORITIES, rows),
+        status=_pick(rng, STATUSES, rows),
+        start_date=_dates(task_start),
+        end_date=_dates(task_end),
+    ))
+    # Tasks were inserted into a fresh table in order, so their ids are consecutive
+    task_ids = np.arange(first_task_id, first_task_id + rows)
+    linked = (np.arange(rows) % ROWS_PER_PROJECT['tasks'] != 0) & (rng.uniform(size=rows) < DEPENDENCY_PROBABILITY)
+    conn.execute(task_dependencies_table.insert(), _records(
+        project_id=[owner_ids[index] for index in np.flatnonzero(linked)],
+        task_id=task_ids[linked].tolist(),
+        depends_on_id=(task_ids[linked] - 1).tolist(),
+    ))
+
+    owner, owner_ids = children('risks')
+    rows = len(owner)
+    likelihood = rng.uniform(0, 1, rows).round(3)
+    impact = rng.uniform(0, 1, rows).round(3)
+    conn.execute(risks_table.insert(), _records(
+        project_id=owner_ids,
+        risk=[f"Risk {index % ROWS_PER_PROJECT['risks'] + 1}" for index in range(rows)],
+        likelihood=likelihood,
+        impact=impact,
+        severity=(likelihood * impact).round(4),
+        status=_pick(rng, RISK_STATUSES, rows),
+    ))
+
+    owner, owner_ids = children('budget')
+    allocated = (budget[owner] / ROWS_PER_PROJECT['budget']).round(2)
+    conn.execute(budget_table.insert(), _records(
+        project_id=owner_ids,
+        category=_pick(rng, BUDGET_CATEGORIES, len(owner)),
+        allocated=allocated,
+        spent=(allocated * rng.uniform(0, 1.2, len(owner))).round(2),
+    ))
+
+    owner, owner_ids = children('issues')
+    conn.execute(issues_table.insert(), _records(
+        project_id=owner_ids,
+        description=[f"Issue {index % ROWS_PER_PROJECT['issues'] + 1}" for index in range(len(owner))],
+        priority=_pick(rng, PRIORITIES, len(owner)),
+        status=_pick(rng, ISSUE_STATUSES, len(owner)),
+    ))
+
+    owner, owner_ids = children('resources')
+    conn.execute(resources_table.insert(), _records(
+        project_id=owner_ids,
+        resource_name=[f"Person {index:05d}" for index in rng.integers(0, people, len(owner))],
+        allocation=np.array(ALLOCATIONS, dtype=float)[rng.integers(0, len(ALLOCATIONS), len(owner))].tolist(),
+    ))
+
+    owner, owner_ids = children('costs')
+    planned = (budget[owner] * rng.uniform(0.1, 0.5, len(owner))).round(2)
+    conn.execute(costs_table.insert(), _records(
+        project_id=owner_ids,
+        category=_pick(rng, BUDGET_CATEGORIES, len(owner)),
+        planned_cost=planned,
+        actual_cost=(planned * rng.uniform(0.7, 1.4, len(owner))).round(2),
+        status=_pick(rng, COST_STATUSES, len(owner)),
+    ))
+
+    owner, owner_ids = children('milestones')
+    conn.execute(milestones_table.insert(), _records(
+        project_id=owner_ids,
+        milestone=[f"Milestone {index % ROWS_PER_PROJECT['milestones'] + 1}" for index in range(len(owner))],
+        due_date=_dates(start[owner] + rng.integers(0, 720, len(owner)) % duration[owner]),
+        status=_pick(rng, STATUSES, len(owner)),
+    ))
+
+    owner, owner_ids = children('todos')
+    conn.execute(todos_table.insert(), _records(
+        project_id=owner_ids,
+        task=[f"To-do {index % ROWS_PER_PROJECT['todos'] + 1}" for index in range(len(owner))],
+        priority=_pick(rng, PRIORITIES, len(owner)),
+        status=_pick(rng, STATUSES, len(owner)),
+        due_date=_dates(start[owner] + rng.integers(0, 720, len(owner)) % duration[owner]),
+    ))
+
+    owner, owner_ids = children('cash_flows')
+    period = np.arange(len(owner)) % ROWS_PER_PROJECT['cash_flows']
+    investment = budget[owner]
+    amount = np.where(period == 0, -investment, investment * rng.normal(0.25, 0.1, len(owner)))
+    conn.execute(cash_flows_table.insert(), _records(
+        project_id=owner_ids,
+        period=period.tolist(),
+        amount=amount.round(2),
+    ))
+
+    # One change day in each of SNAPSHOTS_PER_PROJECT equal slices of the history, so a
+    # project's dates are distinct; scope grows and work completes as the slices pass
+    owner = np.repeat(np.arange(count), SNAPSHOTS_PER_PROJECT)
+    step = np.arange(len(owner)) % SNAPSHOTS_PER_PROJECT
+    slice_days = HISTORY_DAYS // SNAPSHOTS_PER_PROJECT
+    completion = (step + 1) / SNAPSHOTS_PER_PROJECT
+    scope = np.ceil(ROWS_PER_PROJECT['tasks'] * (0.5 + 0.5 * completion)).astype(int)
+    levels = {
+        'spent': (budget[owner] * completion * rng.uniform(0.8, 1.1, len(owner))).round(2),
+        'budget': budget[owner],
+        'tasks': scope,
+        'tasks_completed': np.floor(scope * completion * 0.9).astype(int),
+        'open_issues': rng.integers(0, ROWS_PER_PROJECT['issues'] + 1, len(owner)),
+        'open_risks': rng.integers(0, ROWS_PER_PROJECT['risks'] + 1, len(owner)),
+    }
+    changes = {}
+    for name, values in levels.items():
+        change = values.copy()
+        change[step > 0] -= values[:-1][step[1:] > 0]
+        changes[f"{name}_change"] = change.tolist()
+    conn.execute(project_snapshots_table.insert(), _records(
+        project_id=project_ids[owner].tolist(),
+        snapshot_date=_dates(step * slice_days + rng.integers(0, slice_days, len(owner))),
+        **{name: values.tolist() for name, values in levels.items()},
+        **changes,
+    ))
+
+
+# Fill a new database with `projects` synthetic projects and their child rows
+def generate_portfolio(bind, projects, seed=0, progress=None):
+    init_schema(bind)
+    rng = np.random.default_rng(seed)
+    people = max(projects // 4, 10)
+    for first in range(0, projects, GENERATE_CHUNK):
+        count = min(GENERATE_CHUNK, projects - first)
+        with bind.begin() as conn:
+            _generate_chunk(conn, rng, first + 1, count, people)
+        if progress:
+            progress(first + count, projects)
+    summary.rebuild(bind)
+
+
+def project_count(bind):
+    init_schema(bind)
+    with bind.connect() as conn:
+        return conn.execute(select(func.count()).select_from(projects_table)).scalar()
+
+
+def load_project_df(bind):
+    title, table, headings = report_export.REPORT_SECTIONS[0]
+    project_df = analytics.fetch_frame(select(table), headings, bind)
+    project_df['Start Date'] = pd.to_datetime(project_df['Start Date'])
+    project_df['End Date'] = pd.to_datetime(project_df['End Date'])
+    return project_df
+
+
+def _largest_project(bind):
+    with bind.connect() as conn:
+        return conn.execute(
+            select(tasks_table.c.project_id).group_by(tasks_table.c.project_id).order_by(func.count().desc()).limit(1)
+        ).scalar()
+
+
+def _project_names(bind, context):
+    with bind.connect() as conn:
+        conn.execute(select(projects_table.c.name).order_by(projects_table.c.id)).scalars().all()
+
+
+def _overview_figures(bind, context):
+    from sections.common import project_overview_figures
+
+    figure_cache.figures.clear()
+    project_overview_figures(('benchmark',), context['project_df'])
+
+
+def _task_page(bind, context):
+    conditions = paging.build_conditions(tasks_table, context['project'], {'status': None})
+    paging.count_rows(tasks_table, conditions, bind)
+    paging.fetch_page(tasks_table, conditions, bind=bind)
+
+
+def _resource_capacity(bind, context):
+    segments = capacity.utilization_segments(capacity.load_bookings(bind))
+    capacity.overbooked_periods(segments)
+    capacity.monthly_peak(segments)
+
+
+def _risk_exposure(bind, context):
+    risk_exposure.risk_heatmap(*risk_exposure.load_risk_points("Open", bind))
+    risk_exposure.top_exposures(20, "Open", bind)
+
+
+def _issue_counts(bind, context):
+    conditions = paging.build_conditions(issues_table, context['project'])
+    paging.group_counts(issues_table, conditions, ['status', 'priority'], bind)
+
+
+# The last `days` days of the synthetic history
+def _history_range(days):
+    end = FIRST_START + datetime.timedelta(days=HISTORY_DAYS - 1)
+    return end - datetime.timedelta(days=days - 1), end
+
+
+# (page, code path, function(bind, context)); context holds inputs shared between cases
+CASES = [
+    ("Navigation", "project names", _project_names),
+    ("Dashboard", "load projects", lambda bind, context: load_project_df(bind)),
+    ("Dashboard", "overview figures", _overview_figures),
+    ("Dashboard", "earned value rollup", lambda bind, context: rollup.portfolio_rollup(datetime.date.today(), bind)),
+    ("Executive Overview", "project summary", lambda bind, context: summary.load_summary(bind)),
+    ("Task Management", "first page", _task_page),
+    ("Gantt Chart", "critical path", lambda bind, context: schedule.project_schedule(context['project'], bind)),
+    ("Resource Tracking", "capacity sweep", _resource_capacity),
+    ("Risk Management", "exposure heatmap", _risk_exposure),
+    ("Issue Management", "status counts", _issue_counts),
+    ("ROI Calculation", "portfolio ROI", lambda bind, context: portfolio_roi.portfolio_roi(0.1, bind)),
+    ("Reporting", "table counts", lambda bind, context: report_export.table_counts(bind=bind)),
+    ("Search", "ranked hits", lambda bind, context: search.search("task 3", bind=bind)),
+    ("Burn Charts", "portfolio 180 days", lambda bind, context: history.load_history(*_history_range(180), bind=bind)),
+    ("Burn Charts", "project full history", lambda bind, context: history.load_history(*_history_range(HISTORY_DAYS), context['project'], bind)),
+]
+
+
+def case_name(page, path):
+    return f"{page}: {path}"
+
+
+# Median, min and max milliseconds per case over `repeat` runs
+def run_cases(bind, repeat=DEFAULT_REPEAT, cases=CASES):
+    context = {'project': _largest_project(bind), 'project_df': load_project_df(bind)}
+    results = {}
+    for page, path, function in cases:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function(bind, context)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[case_name(page, path)] = {
+            'median_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+        }
+    return results
+
+
+def benchmark_size(projects, workdir=DEFAULT_WORKDIR, repeat=DEFAULT_REPEAT, regenerate=False, log=None, mirror=False):
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, f"bench_{projects}.db")
+    if regenerate and os.path.exists(path):
+        os.remove(path)
+    bind = make_engine(f"sqlite:///{path}")
+    try:
+        if project_count(bind) != projects:
+            bind.dispose()
+            os.remove(path)
+            bind = make_engine(f"sqlite:///{path}")
+            started = time.perf_counter()
+            generate_portfolio(bind, projects, progress=lambda done, total: log and log(f"  generated {done}/{total} projects"))
+            if log:
+                log(f"  generated {projects} projects in {time.perf_counter() - started:.1f}s")
+        # Built once per database (triggers keep it current), so not part of any timing
+        search.ensure_index(bind)
+        if mirror:
+            # The first sync copies every table; that one-off cost is logged, not timed
+            mirror_path = os.path.join(workdir, f"bench_{projects}.duckdb")
+            if regenerate and os.path.exists(mirror_path):
+                os.remove(mirror_path)
+            started = time.perf_counter()
+            analytics.attach(bind, mirror_path).sync()
+            if log:
+                log(f"  synced analytics mirror in {time.perf_counter() - started:.1f}s")
+        return run_cases(bind, repeat)
+    finally:
+        analytics.detach(bind)
+        bind.dispose()
+
+
+def _change(current, baseline):
+    if baseline is None:
+        return "", False
+    delta = current - baseline
+    ratio = delta / baseline if baseline else 0.0
+    regression = ratio > REGRESSION_RATIO and delta > REGRESSION_MIN_MS
+    return f"{ratio:+.0%}", regression
+
+
+# Plain-text table of median times per case and size, with changes against a baseline
+def format_report(results, baseline=None):
+    sizes = sorted(results, key=int)
+    names = [case_name(page, path) for page, path, _ in CASES]
+    width = max(len(name) for name in names) + 2
+    lines = [f"Median ms per case{' (change vs baseline)' if baseline else ''}", ""]
+    lines.append("case".ljust(width) + "".join(f"{size + ' projects':>24}" for size in sizes))
+    regressions = []
+    for name in names:
+        cells = []
+        for size in sizes:
+            current = results[size].get(name)
+            if current is None:
+                cells.append(f"{'-':>24}")
+                continue
+            previous = (baseline or {}).get(size, {}).get(name)
+            change, regression = _change(current['median_ms'], previous['median_ms'] if previous else None)
+            if regression:
+                regressions.append(f"{name} at {size} projects: {previous['median_ms']:.1f} -> {current['median_ms']:.1f} ms")
+            cell = f"{current['median_ms']:.1f}" + (f" ({change})" if change else "") + ("!" if regression else "")
+            cells.append(f"{cell:>24}")
+        lines.append(name.ljust(width) + "".join(cells))
+    if baseline:
+        lines.append("")
+        if regressions:
+            lines.append(f"{len(regressions)} regression(s) (more than {REGRESSION_RATIO:.0%} and {REGRESSION_MIN_MS:.0f} ms slower):")
+            lines.extend(f"  {regression}" for regression in regressions)
+        else:
+            lines.append("No regressions against the baseline.")
+    return "\n".join(lines), regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Business Transformation app's page code on synthetic portfolios.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Portfolio sizes, in projects")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help="Directory for the generated databases (reused between runs)")
+    parser.add_argument('--regenerate', action='store_true', help="Rebuild the synthetic databases even if they exist")
+    parser.add_argument('--output', help="Write the results as JSON, for use as a later --baseline")
+    parser.add_argument('--baseline', help="Earlier --output file to compare against")
+    parser.add_argument('--report', help="Also write the text report to this file")
+    parser.add_argument('--mirror', action='store_true', help="Run analytics reads against a DuckDB mirror of each database")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    results = {}
+    for size in args.sizes:
+        log(f"{size} projects")
+        results[str(size)] = benchmark_size(size, args.workdir, args.repeat, args.regenerate, log, args.mirror)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as source:
+            baseline = json.load(source)['results']
+    report, regressions = format_report(results, baseline)
+    print(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as target:
+            target.write(report + "\n")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as target:
+            json.dump({'created': datetime.datetime.now().isoformat(timespec='seconds'), 'repeat': args.repeat, 'results': results}, target, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
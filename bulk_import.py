@@ -0,0 +1,239 @@
+import argparse
+import os
+import sys
+
+import pandas as pd
+from sqlalchemy import Date, Float, Integer, func, select
+
+import summary
+from db import (
+    engine, init_schema, projects_table, tasks_table, risks_table, budget_table, resources_table,
+    issues_table, milestones_table, charter_table, costs_table, todos_table, portfolio_table,
+    calendar_table, cost_estimations_table, cash_flows_table
+)
+
+# Tables that can be loaded from a file; users are deliberately left out
+IMPORT_TABLES = {
+    'projects': projects_table,
+    'tasks': tasks_table,
+    'risks': risks_table,
+    'budget': budget_table,
+    'resources': resources_table,
+    'issues': issues_table,
+    'milestones': milestones_table,
+    'charter': charter_table,
+    'costs': costs_table,
+    'todos': todos_table,
+    'portfolio': portfolio_table,
+    'calendar': calendar_table,
+    'cost_estimations': cost_estimations_table,
+    'cash_flows': cash_flows_table,
+}
+
+DEFAULT_CHUNKSIZE = 5000
+
+# Lowest value accepted for (table, column); a cash flow's period indexes the ROI matrix
+MINIMUM_VALUES = {('cash_flows', 'period'): 0}
+
+# Only the first few rejected rows are kept in the report so a bad file can't exhaust memory
+MAX_REPORTED_ERRORS = 50
+
+
+class BulkImportError(Exception):
+    pass
+
+
+def detect_format(name):
+    extension = os.path.splitext(name)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension == '.csv':
+        return 'csv'
+    raise BulkImportError(f"Unsupported file type '{extension}', expected .csv or .parquet")
+
+
+# Yield DataFrames of at most chunksize rows without loading the whole file
+def iter_chunks(source, file_format, chunksize=DEFAULT_CHUNKSIZE):
+    if file_format == 'csv':
+        yield from pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False, na_values=[''])
+    elif file_format == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise BulkImportError(f"Unsupported file format '{file_format}'")
+
+
+def count_rows(source, file_format):
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(source).metadata.num_rows
+    return None
+
+
+# Project name -> id, the oldest project winning when a name is used twice
+def load_project_ids(conn):
+    query = select(projects_table.c.name, func.min(projects_table.c.id)).group_by(projects_table.c.name)
+    return dict(conn.execute(query).fetchall())
+
+
+# Every project id, to check ids given directly in a file
+def load_known_ids(conn):
+    return set(conn.execute(select(projects_table.c.id)).scalars())
+
+
+# Check columns and coerce types for one chunk.
+# Files may name the project in a project_name column instead of giving project_id;
+# project_ids maps those names to ids. Rows of project tables must name a project, and
+# given project_ids must be in known_ids when that is passed. Integer columns take whole
+# numbers only, and columns that can't be NULL need a value in every row.
+# Returns the insertable records and a list of (row_number, message) for rejected rows.
+def validate_chunk(table, chunk, first_row, project_ids=None, known_ids=None):
+    by_name = 'project_id' in table.c and 'project_name' in chunk.columns
+    if by_name and 'project_id' in chunk.columns:
+        raise BulkImportError("Give either project_id or project_name, not both")
+    unknown = [name for name in chunk.columns if name not in table.c and not (by_name and name == 'project_name')]
+    if unknown:
+        raise BulkImportError(f"Unknown columns for table '{table.name}': {', '.join(unknown)}")
+
+    columns = [column for column in table.columns if column.name != 'id']
+    required = [column.name for column in columns if not column.nullable and column.name not in chunk.columns]
+    if required:
+        raise BulkImportError(f"Missing columns for table '{table.name}': {', '.join(required)}")
+    data = pd.DataFrame(index=chunk.index)
+    invalid = pd.Series(False, index=chunk.index)
+    errors = []
+
+    if by_name:
+        names = chunk['project_name']
+        chunk = chunk.drop(columns='project_name')
+        chunk['project_id'] = names.map(project_ids or {})
+        bad = chunk['project_id'].isna() & names.notna()
+        for position in bad.to_numpy().nonzero()[0]:
+            errors.append((first_row + int(position), f"unknown project_name: {names.iloc[position]!r}"))
+        invalid |= bad
+
+    for column in columns:
+        if column.name not in chunk.columns:
+            data[column.name] = None
+            continue
+        raw = chunk[column.name]
+        if isinstance(column.type, Date):
+            values = pd.to_datetime(raw, errors='coerce')
+            bad = values.isna() & raw.notna()
+            data[column.name] = values.dt.date.astype(object).where(values.notna(), None)
+        elif isinstance(column.type, (Float, Integer)):
+            values = pd.to_numeric(raw, errors='coerce')
+            bad = values.isna() & raw.notna()
+            if isinstance(column.type, Integer):
+                bad |= values.notna() & (values % 1 != 0)
+            minimum = MINIMUM_VALUES.get((table.name, column.name))
+            if minimum is not None:
+                bad |= values < minimum
+            data[column.name] = values.astype(object).where(values.notna(), None)
+        else:
+            bad = pd.Series(False, index=chunk.index)
+            data[column.name] = raw.astype(str).astype(object).where(raw.notna(), None)
+
+        for position in bad.to_numpy().nonzero()[0]:
+            errors.append((first_row + int(position), f"invalid {column.name}: {raw.iloc[position]!r}"))
+        invalid |= bad
+
+        if not column.nullable:
+            missing = raw.isna()
+            for position in missing.to_numpy().nonzero()[0]:
+                errors.append((first_row + int(position), f"missing {column.name}"))
+            invalid |= missing
+
+    if 'project_id' in table.c:
+        project_id = data['project_id']
+        missing = project_id.isna() & ~invalid
+        for position in missing.to_numpy().nonzero()[0]:
+            errors.append((first_row + int(position), "missing project_name" if by_name else "missing project_id"))
+        invalid |= missing
+        if known_ids is not None and not by_name:
+            bad = ~project_id.isin(known_ids) & ~invalid
+            for position in bad.to_numpy().nonzero()[0]:
+                errors.append((first_row + int(position), f"unknown project_id: {chunk['project_id'].iloc[position]!r}"))
+            invalid |= bad
+
+    return data[~invalid].to_dict('records'), errors
+
+
+# Stream a CSV/Parquet file into a table in executemany batches inside one transaction.
+# progress, if given, is called after each chunk with the running report.
+# With strict=True any rejected row aborts and rolls back the whole import.
+def import_file(source, table_name, file_format=None, chunksize=DEFAULT_CHUNKSIZE, strict=False, progress=None, bind=engine):
+    if table_name not in IMPORT_TABLES:
+        raise BulkImportError(f"Unknown table '{table_name}'")
+    table = IMPORT_TABLES[table_name]
+    if file_format is None:
+        file_format = detect_format(getattr(source, 'name', source))
+
+    report = {
+        'table': table_name,
+        'total_rows': count_rows(source, file_format),
+        'chunks': 0,
+        'rows_read': 0,
+        'rows_inserted': 0,
+        'rows_rejected': 0,
+        'errors': [],
+    }
+
+    with bind.begin() as conn:
+        project_ids = known_ids = None
+        if 'project_id' in table.c:
+            project_ids = load_project_ids(conn)
+            known_ids = load_known_ids(conn)
+        for chunk in iter_chunks(source, file_format, chunksize):
+            # Row numbers are 1-based data rows, not counting a CSV header
+            records, errors = validate_chunk(table, chunk, report['rows_read'] + 1, project_ids, known_ids)
+            if errors and strict:
+                row, message = errors[0]
+                raise BulkImportError(f"Row {row}: {message}; import rolled back")
+            if records:
+                summary.insert_records(conn, table, records)
+
+            report['chunks'] += 1
+            report['rows_read'] += len(chunk)
+            report['rows_inserted'] += len(records)
+            report['rows_rejected'] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(report['errors'])
+            report['errors'].extend(errors[:max(room, 0)])
+            if progress:
+                progress(report)
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import CSV or Parquet files into the Business Transformation database.")
+    parser.add_argument('table', choices=sorted(IMPORT_TABLES), help="Target table")
+    parser.add_argument('path', help="CSV or Parquet file to import")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="File format (default: from the file extension)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Rows per batch")
+    parser.add_argument('--strict', action='store_true', help="Abort the whole import on the first invalid row")
+    args = parser.parse_args(argv)
+
+    def print_progress(report):
+        total = f"/{report['total_rows']}" if report['total_rows'] is not None else ""
+        print(f"chunk {report['chunks']}: {report['rows_read']}{total} rows read, "
+              f"{report['rows_inserted']} inserted, {report['rows_rejected']} rejected", file=sys.stderr)
+
+    init_schema()
+    summary.ensure_built()
+    try:
+        report = import_file(args.path, args.table, args.format, args.chunksize, args.strict, print_progress)
+    except BulkImportError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    for row, message in report['errors']:
+        print(f"row {row}: {message}", file=sys.stderr)
+    print(f"Imported {report['rows_inserted']} of {report['rows_read']} rows into {args.table} "
+          f"({report['rows_rejected']} rejected)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+import analytics
+from db import engine, projects_table, resources_table, tasks_table
+
+# Resource capacity across the portfolio.
+#
+# A resource row books one person at `allocation` percent of their time for the project's
+# duration: projects.start_date/end_date, or the span of the project's tasks when the
+# project dates are missing. Each booking becomes a +allocation event on its first day and
+# a -allocation event the day after it ends; sorting all events by (person, day) and taking
+# a running sum gives every person's utilization as a list of constant-level segments,
+# with no per-day loops.
+
+CAPACITY = 100.0
+# Heatmap rows: the people with the highest peak utilization
+HEATMAP_PEOPLE = 50
+
+
+def load_bookings(bind=engine):
+    task_spans = (
+        select(
+            tasks_table.c.project_id,
+            func.min(tasks_table.c.start_date).label('task_start'),
+            func.max(tasks_table.c.end_date).label('task_end'),
+        )
+        .group_by(tasks_table.c.project_id)
+        .subquery()
+    )
+    query = (
+        select(
+            resources_table.c.resource_name,
+            projects_table.c.name,
+            resources_table.c.allocation,
+            func.coalesce(projects_table.c.start_date, task_spans.c.task_start),
+            func.coalesce(projects_table.c.end_date, task_spans.c.task_end),
+        )
+        .select_from(resources_table)
+        .join(projects_table, projects_table.c.id == resources_table.c.project_id)
+        .outerjoin(task_spans, task_spans.c.project_id == resources_table.c.project_id)
+    )
+    return analytics.fetch_frame(query, ['Resource Name', 'Project Name', 'Allocation', 'Start Date', 'End Date'], bind)
+
+
+# Per-person utilization segments: Resource Name, Start, End (exclusive), Utilization.
+# Only periods where the person is booked at all are returned.
+def utilization_segments(bookings):
+    columns = ['Resource Name', 'Start', 'End', 'Utilization']
+    if bookings.empty:
+        return pd.DataFrame(columns=columns)
+    names = bookings['Resource Name'].fillna("").astype(str).str.strip()
+    starts = analytics.to_days(bookings['Start Date'])
+    stops = analytics.to_days(bookings['End Date']) + np.timedelta64(1, 'D')
+    allocation = pd.to_numeric(bookings['Allocation'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    valid = ~np.isnat(starts) & ~np.isnat(stops) & (stops > starts) & (names.to_numpy() != "") & (allocation != 0)
+    if not valid.any():
+        return pd.DataFrame(columns=columns)
+
+    codes, people = pd.factorize(names[valid])
+    person = np.concatenate([codes, codes])
+    day = np.concatenate([starts[valid], stops[valid]]).astype(np.int64)
+    delta = np.concatenate([allocation[valid], -allocation[valid]])
+
+    order = np.lexsort((day, person))
+    person, day = person[order], day[order]
+    # Each person's events net to zero, so one global running sum is every person's level
+    level = np.round(np.cumsum(delta[order]), 6)
+
+    # Several events on the same day: only the level after the last one counts
+    last = np.ones(len(day), dtype=bool)
+    last[:-1] = (person[1:] != person[:-1]) | (day[1:] != day[:-1])
+    person, day, level = person[last], day[last], level[last]
+
+    # A segment runs from one event day to the person's next event day
+    same_person = person[:-1] == person[1:]
+    booked = same_person & (level[:-1] > 0)
+    return pd.DataFrame({
+        'Resource Name': people[person[:-1][booked]],
+        'Start': day[:-1][booked].astype('datetime64[D]'),
+        'End': day[1:][booked].astype('datetime64[D]'),
+        'Utilization': level[:-1][booked],
+    })
+
+
+# Segments where a person is booked above capacity, worst first
+def overbooked_periods(segments, capacity=CAPACITY):
+    over = segments[segments['Utilization'] > capacity]
+    over = over.assign(**{'Days': (over['End'] - over['Start']).dt.days, 'Over by': over['Utilization'] - capacity})
+    return over.sort_values(['Utilization', 'Days'], ascending=False, ignore_index=True)
+
+
+# Peak utilization per person per calendar month, as a people x months table
+def monthly_peak(segments, people=HEATMAP_PEOPLE):
+    if segments.empty:
+        return pd.DataFrame()
+    start_month = segments['Start'].to_numpy().astype('datetime64[M]')
+    # End is exclusive, so the segment's last day decides its last month
+    end_month = (segments['End'].to_numpy() - np.timedelta64(1, 'D')).astype('datetime64[M]')
+    months = (end_month - start_month).astype(np.int64) + 1
+    rows = np.repeat(np.arange(len(segments)), months)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(months) - months, months)
+    expanded = pd.DataFrame({
+        'Resource Name': segments['Resource Name'].to_numpy()[rows],
+        'Month': start_month[rows] + offsets.astype('timedelta64[M]'),
+        'Utilization': segments['Utilization'].to_numpy()[rows],
+    })
+    peaks = expanded.groupby(['Resource Name', 'Month'])['Utilization'].max().unstack('Month')
+    busiest = peaks.max(axis=1).sort_values(ascending=False).index[:people]
+    # Months with no bookings at all still get a (blank) column so the time axis is continuous
+    all_months = np.arange(start_month.min(), end_month.max() + np.timedelta64(1, 'M'))
+    peaks = peaks.loc[busiest].reindex(columns=all_months)
+    peaks.columns = [str(month) for month in all_months]
+    return peaks
+
+
+def portfolio_utilization(bind=engine):
+    return utilization_segments(load_bookings(bind))
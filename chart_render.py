@@ -0,0 +1,83 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import plotly.io as pio
+
+# PNG rasterisation for the presentation PDF. Figures are rendered concurrently by a
+# shared worker pool straight into bytes (no files in the working directory), and each
+# PNG is cached under a hash of the figure's JSON, which covers both its data and its
+# layout. Regenerating a PDF whose data hasn't changed therefore skips Kaleido entirely.
+# The JSON is hashed with sorted keys: a figure rebuilt by figure_cache from its JSON
+# serialises its properties in a different order from the figure it was built from.
+
+RENDER_WORKERS = 4
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+PNG_WIDTH = 1200
+PNG_HEIGHT = 700
+
+_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="chart-render")
+
+
+class PngCache:
+    def __init__(self, max_bytes=MAX_CACHED_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = png
+            self.size += len(png)
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+pngs = PngCache()
+
+
+def figure_hash(figure):
+    canonical = json.dumps(json.loads(figure.to_json()), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _render(figure):
+    return pio.to_image(figure, format='png', width=PNG_WIDTH, height=PNG_HEIGHT)
+
+
+# Render a dict of name -> figure to name -> PNG bytes; only uncached figures hit Kaleido
+def render_pngs(figures):
+    keys = {name: figure_hash(figure) for name, figure in figures.items()}
+    results = {}
+    pending = {}
+    for name, figure in figures.items():
+        png = pngs.get(keys[name])
+        if png is not None:
+            results[name] = png
+        else:
+            pending[name] = _executor.submit(_render, figure)
+
+    for name, future in pending.items():
+        png = future.result()
+        pngs.put(keys[name], png)
+        results[name] = png
+    return {name: results[name] for name in figures}
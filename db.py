@@ -0,0 +1,356 @@
+import os
+import threading
+import weakref
+
+from sqlalchemy import create_engine, event, func, select, text, Column, Integer, String, Float, Date, ForeignKey, Index, MetaData, Table
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+# Initialize database connection
+DATABASE_URL = os.environ.get("BT_DATABASE_URL", "sqlite:///jayjay_bt_app.db")
+
+# How long a connection waits on a locked database before giving up (seconds)
+BUSY_TIMEOUT = 30
+
+# Pool sizing for concurrent Streamlit sessions; each script run checks out one connection
+POOL_SIZE = 10
+MAX_OVERFLOW = 50
+
+
+def make_engine(url=DATABASE_URL):
+    engine = create_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+        connect_args={"timeout": BUSY_TIMEOUT, "check_same_thread": False},
+    )
+
+    # WAL lets readers proceed while one writer commits, and busy_timeout makes
+    # writers queue on the lock instead of failing with "database is locked"
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # SQLite only enforces the project_id foreign keys when asked to, per connection
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine
+
+
+# Module imports are cached by Python, so the engine and its pool are created once
+# per process and shared by every Streamlit session instead of once per rerun
+engine = make_engine()
+metadata = MetaData()
+
+# One session per script-run thread; app.py removes it at the start and end of each run
+Session = scoped_session(sessionmaker(bind=engine))
+
+# Define table structure
+projects_table = Table(
+    'projects', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('name', String, index=True),
+    Column('start_date', Date),
+    Column('end_date', Date),
+    Column('budget', Float),
+    Column('spent', Float),
+    Column('status', String),
+    Column('portfolio', String),
+    Column('impact', Float),
+    Column('deliverable', String),
+    Column('timeline', String)
+)
+tasks_table = Table(
+    'tasks', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('task', String),
+    Column('priority', String),
+    Column('status', String),
+    Column('start_date', Date),
+    Column('end_date', Date)
+)
+# Finish-to-start links between tasks: task_id cannot start before depends_on_id finishes
+task_dependencies_table = Table(
+    'task_dependencies', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('task_id', Integer, ForeignKey('tasks.id'), index=True),
+    Column('depends_on_id', Integer, ForeignKey('tasks.id'), index=True)
+)
+risks_table = Table(
+    'risks', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('risk', String),
+    Column('likelihood', Float),
+    Column('impact', Float),
+    Column('severity', Float, index=True),
+    Column('status', String)
+)
+budget_table = Table(
+    'budget', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('category', String),
+    Column('allocated', Float),
+    Column('spent', Float)
+)
+resources_table = Table(
+    'resources', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('resource_name', String),
+    Column('allocation', Float)
+)
+issues_table = Table(
+    'issues', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('description', String),
+    Column('priority', String),
+    Column('status', String)
+)
+milestones_table = Table(
+    'milestones', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('milestone', String),
+    Column('due_date', Date),
+    Column('status', String)
+)
+charter_table = Table(
+    'charter', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('objective', String),
+    Column('scope', String),
+    Column('stakeholders', String)
+)
+costs_table = Table(
+    'costs', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('category', String),
+    Column('planned_cost', Float),
+    Column('actual_cost', Float),
+    Column('status', String)
+)
+todos_table = Table(
+    'todos', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('task', String),
+    Column('priority', String),
+    Column('status', String),
+    Column('due_date', Date)
+)
+portfolio_table = Table(
+    'portfolio', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('portfolio_type', String)
+)
+calendar_table = Table(
+    'calendar', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('event_name', String),
+    Column('event_date', Date)
+)
+cost_estimations_table = Table(
+    'cost_estimations', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('item', String),
+    Column('estimated_cost', Float)
+)
+# Per-project cash-flow series for portfolio ROI; period 0 holds the (negative) investment
+cash_flows_table = Table(
+    'cash_flows', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('period', Integer, nullable=False),
+    Column('amount', Float)
+)
+# Per-project rollup maintained by summary.py in the same transaction as each insert
+project_summary_table = Table(
+    'project_summary', metadata,
+    Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
+    Column('tasks', Integer),
+    Column('tasks_not_started', Integer),
+    Column('tasks_in_progress', Integer),
+    Column('tasks_completed', Integer),
+    Column('issues', Integer),
+    Column('open_issues', Integer),
+    Column('high_priority_open_issues', Integer),
+    Column('risks', Integer),
+    Column('open_risks', Integer),
+    Column('open_risk_exposure', Float),
+    Column('max_open_severity', Float),
+    Column('budget_allocated', Float),
+    Column('budget_lines_spent', Float),
+    Column('planned_cost', Float),
+    Column('actual_cost', Float),
+    Column('resources', Integer),
+    Column('resource_allocation', Float),
+    Column('milestones', Integer),
+    Column('milestones_completed', Integer),
+    Column('todos', Integer),
+    Column('todos_completed', Integer),
+    Column('estimated_cost', Float)
+)
+# Append-only daily history of each project's tracked levels, written by history.py. A
+# project gets a row only on days its levels change; the latest row on or before a date
+# holds the levels on that date, and each *_change column is the row's level minus the
+# project's previous row's, so portfolio trends sum changes from the covering index.
+project_snapshots_table = Table(
+    'project_snapshots', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), nullable=False),
+    Column('snapshot_date', Date, nullable=False),
+    Column('spent', Float),
+    Column('budget', Float),
+    Column('tasks', Integer),
+    Column('tasks_completed', Integer),
+    Column('open_issues', Integer),
+    Column('open_risks', Integer),
+    Column('spent_change', Float),
+    Column('budget_change', Float),
+    Column('tasks_change', Integer),
+    Column('tasks_completed_change', Integer),
+    Column('open_issues_change', Integer),
+    Column('open_risks_change', Integer),
+    Index('ix_project_snapshots_project_date', 'project_id', 'snapshot_date', unique=True),
+    Index(
+        'ix_project_snapshots_date_changes', 'snapshot_date', 'spent_change', 'budget_change', 'tasks_change',
+        'tasks_completed_change', 'open_issues_change', 'open_risks_change'
+    )
+)
+users_table = Table(
+    'users', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('username', String, unique=True),
+    Column('password', String)
+)
+
+
+
+# create_all only builds indexes alongside tables it creates, so databases made
+# before an index was declared (e.g. the shipped jayjay_bt_app.db) get them here
+def create_missing_indexes(engine):
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+# Tables whose rows belong to a project through project_id
+PROJECT_TABLES = [table for table in metadata.sorted_tables if 'project_id' in table.c and table is not project_summary_table]
+
+# Rows fetched by id range per transaction while backfilling project_id
+MIGRATION_BATCH = 5000
+
+
+# A table's rows with project_id replaced by the project's name, columns in table order
+# or as listed in column_names. Used wherever rows are shown or exported, so people see
+# names rather than ids.
+def named_select(table, column_names=None):
+    columns = [table.c[name] for name in column_names] if column_names else list(table.c)
+    if 'project_id' not in table.c:
+        return select(*columns)
+    columns = [projects_table.c.name.label('project_name') if column.name == 'project_id' else column for column in columns]
+    return select(*columns).select_from(table.outerjoin(projects_table, projects_table.c.id == table.c.project_id))
+
+
+def _table_columns(conn, table_name):
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table_name})")}
+
+
+# project_summary used to be keyed on project_name; it is only a cache, so a legacy copy is
+# dropped and rebuilt by summary.ensure_built()
+def _drop_legacy_summary(bind):
+    with bind.begin() as conn:
+        columns = _table_columns(conn, project_summary_table.name)
+        if columns and 'project_id' not in columns:
+            conn.exec_driver_sql(f"DROP TABLE {project_summary_table.name}")
+
+
+# Online upgrade of databases whose child tables link to projects by a project_name
+# string. project_id is added as a nullable column and backfilled from projects.name in
+# short id-range transactions, so readers (and an older app version still writing
+# project_name) carry on meanwhile; rows written during the backfill are picked up because
+# each batch only touches rows whose project_id is still NULL. Names matching several
+# projects resolve to the oldest one; names matching none stay NULL. The legacy column is
+# left in place (new rows leave it NULL) and only its index is dropped;
+# drop_legacy_project_names() removes the columns once nothing reads them.
+def migrate_project_ids(bind=engine, batch_size=MIGRATION_BATCH, progress=None):
+    for index in projects_table.indexes:
+        index.create(bind, checkfirst=True)
+    for table in PROJECT_TABLES:
+        with bind.begin() as conn:
+            columns = _table_columns(conn, table.name)
+            if 'project_name' not in columns:
+                continue
+            if 'project_id' not in columns:
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN project_id INTEGER REFERENCES projects (id)")
+            max_id = conn.execute(select(func.max(table.c.id))).scalar() or 0
+        backfill = text(
+            f"UPDATE {table.name} SET project_id = (SELECT min(projects.id) FROM projects WHERE projects.name = {table.name}.project_name) "
+            f"WHERE id >= :low AND id < :high AND project_id IS NULL AND project_name IS NOT NULL"
+        )
+        for low in range(0, max_id + 1, batch_size):
+            with bind.begin() as conn:
+                conn.execute(backfill, {'low': low, 'high': low + batch_size})
+            if progress:
+                progress(table.name, min(low + batch_size, max_id), max_id)
+        # Rows added by other writers after max_id was read
+        with bind.begin() as conn:
+            conn.execute(backfill, {'low': max_id + 1, 'high': 2 ** 62})
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{table.name}_project_name")
+
+
+# Project names left behind by migrate_project_ids() that match no project
+def unmatched_project_names(bind=engine):
+    unmatched = {}
+    with bind.connect() as conn:
+        for table in PROJECT_TABLES:
+            if 'project_name' in _table_columns(conn, table.name):
+                count = conn.exec_driver_sql(
+                    f"SELECT count(*) FROM {table.name} WHERE project_id IS NULL AND project_name IS NOT NULL"
+                ).scalar()
+                if count:
+                    unmatched[table.name] = count
+    return unmatched
+
+
+# Remove the legacy project_name columns. Each ALTER rewrites its table, so run this
+# once the migration is done and no older app version is still writing names.
+def drop_legacy_project_names(bind=engine):
+    with bind.connect() as conn:
+        tables = [table.name for table in PROJECT_TABLES if 'project_name' in _table_columns(conn, table.name)]
+    for table_name in tables:
+        with bind.begin() as conn:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{table_name}_project_name")
+            conn.exec_driver_sql(f"ALTER TABLE {table_name} DROP COLUMN project_name")
+    return tables
+
+
+_schema_ready = weakref.WeakSet()
+_schema_lock = threading.Lock()
+
+
+# Create missing tables and indexes and upgrade older databases, once per engine.
+# Importing this module doesn't touch the database; the app and the command line
+# tools call this first.
+def init_schema(bind=engine):
+    with _schema_lock:
+        if bind in _schema_ready:
+            return
+        _drop_legacy_summary(bind)
+        metadata.create_all(bind)
+        migrate_project_ids(bind)
+        create_missing_indexes(bind)
+        _schema_ready.add(bind)
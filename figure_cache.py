@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.io as pio
+from sqlalchemy import func, select
+
+import instrumentation
+from db import engine
+
+# Process-wide cache of built Plotly figures, stored as JSON and keyed on the version
+# of the data they were drawn from. Reruns that don't change the data (moving a color
+# picker, switching pages) skip DataFrame construction and the px.* calls entirely.
+
+MAX_ENTRIES = 64
+
+
+# Cheap fingerprint of a table's contents: rows are only ever appended, so the row
+# count and highest id change whenever the data does
+def table_version(table, bind=engine):
+    with bind.connect() as conn:
+        count, max_id = conn.execute(select(func.count(), func.max(table.c.id)).select_from(table)).one()
+    return table.name, count, max_id
+
+
+class FigureCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # build() must return a dict of name -> figure; the returned figures are always
+    # fresh objects, so callers may modify them without touching the cached copy
+    def get_or_build(self, key, build):
+        started = time.perf_counter()
+        try:
+            return self._get_or_build(key, build)
+        finally:
+            instrumentation.record_figure_build(time.perf_counter() - started)
+
+    def _get_or_build(self, key, build):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if payload is not None:
+            return {name: pio.from_json(figure_json, skip_invalid=True) for name, figure_json in payload.items()}
+
+        figures = build()
+        payload = {name: figure.to_json() for name, figure in figures.items()}
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figures
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+figures = FigureCache()
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Vectorised discounted cash-flow maths over 2-D arrays of cash flows, one series per
+# row with the period-0 flow (usually the negative investment) in column 0.
+#
+# IRR is solved in terms of the discount factor x = 1 / (1 + r), which turns NPV into the
+# polynomial sum(cf[t] * x**t). Its roots are the eigenvalues of the polynomial's
+# companion matrix, built exactly as np.roots builds it, and the companion matrices of
+# all rows of the same degree go to LAPACK as one stacked batch. As in
+# numpy_financial.irr, the rate of every positive real root is a candidate and the one
+# nearest 0% is returned, so series with several sign changes get the same answer.
+
+def _as_matrix(cash_flows):
+    return np.atleast_2d(np.asarray(cash_flows, dtype=float))
+
+
+def npv(rate, cash_flows):
+    cash_flows = _as_matrix(cash_flows)
+    factors = (1.0 + np.asarray(rate, dtype=float)[..., None]) ** -np.arange(cash_flows.shape[1])
+    return (cash_flows * factors).sum(axis=1)
+
+
+# IRR of every row; NaN where the NPV polynomial has no positive real root (the flows
+# never change sign, or are all zero)
+def irr(cash_flows):
+    cash_flows = _as_matrix(cash_flows)
+    rates = np.full(len(cash_flows), np.nan)
+    nonzero = cash_flows != 0
+    has_flows = nonzero.any(axis=1)
+    # Leading zero flows only add roots at x = 0 and trailing ones lower the degree, so
+    # each row's polynomial runs from its first to its last non-zero flow
+    first = np.argmax(nonzero, axis=1)
+    last = cash_flows.shape[1] - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+    degrees = np.where(has_flows, last - first, 0)
+
+    for degree in np.unique(degrees[degrees > 0]):
+        rows = np.flatnonzero(degrees == degree)
+        # Coefficients highest power first: cf[last], cf[last - 1], ..., cf[first]
+        coefficients = cash_flows[rows[:, None], last[rows, None] - np.arange(degree + 1)]
+        companion = np.zeros((len(rows), degree, degree))
+        companion[:, 0, :] = -coefficients[:, 1:] / coefficients[:, :1]
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+        roots = np.linalg.eigvals(companion)
+
+        positive = (roots.imag == 0) & (roots.real > 0)
+        candidates = np.where(positive, 1.0 / np.where(positive, roots.real, 1.0) - 1.0, np.inf)
+        nearest = np.argmin(np.abs(candidates), axis=1)
+        chosen = candidates[np.arange(len(rows)), nearest]
+        rates[rows] = np.where(positive.any(axis=1), chosen, np.nan)
+    return rates
+
+
+# First period in which cumulative cash flow turns non-negative; NaN if it never does
+def payback_period(cash_flows):
+    cumulative = np.cumsum(_as_matrix(cash_flows), axis=1)
+    recovered = cumulative >= 0
+    periods = np.argmax(recovered, axis=1).astype(float)
+    return np.where(recovered.any(axis=1), periods, np.nan)
+
+
+# Simple ROI: total inflows after period 0 relative to the initial investment
+def roi(cash_flows):
+    cash_flows = _as_matrix(cash_flows)
+    investment = -cash_flows[:, 0]
+    returns = cash_flows[:, 1:].sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(investment != 0, (returns - investment) / investment, np.nan)
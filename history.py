@@ -0,0 +1,158 @@
+import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from db import engine, projects_table, project_summary_table, project_snapshots_table
+
+# Trend history for burn-down and burn-up charts. project_snapshots holds each project's
+# tracked levels, one row per project per day on which they changed, written in the same
+# transaction as the insert that changed them (summary.apply_records calls record()).
+# Levels hold until the next row, so a year of history for a project that changed on ten
+# days is ten rows. Each row also stores its change from the project's previous row, so
+# a range query is one index probe per project for the levels in force when the range
+# starts plus a per-day sum of changes read from a covering index, and SQLite returns at
+# most one row per day however many projects the range covers. Rows are only written
+# for today, so a row's previous row never changes after it is written. pandas is only
+# imported by the readers, so recording on the insert path stays light.
+
+METRICS = ['spent', 'budget', 'tasks', 'tasks_completed', 'open_issues', 'open_risks']
+
+# Tables whose inserts move a tracked level; a new project starts its own history
+TRACKED_TABLES = {'projects', 'tasks', 'issues', 'risks', 'budget', 'costs'}
+
+
+def _change(name):
+    return f"{name}_change"
+
+
+# Each project's latest snapshot id before day, correlated to projects
+def _latest_before(day):
+    earlier = project_snapshots_table.alias('earlier')
+    # One probe of the (project_id, snapshot_date) index
+    return (
+        select(earlier.c.id)
+        .where(earlier.c.project_id == projects_table.c.id, earlier.c.snapshot_date < day)
+        .order_by(earlier.c.snapshot_date.desc())
+        .limit(1)
+        .correlate(projects_table)
+        .scalar_subquery()
+    )
+
+
+# Snapshot rows for the given projects (all when None) dated as_of, from the materialised
+# summary. Spent and budget fall back the same way as the earned value rollup's AC and BAC.
+def _snapshot_rows(as_of, project_ids=None):
+    summary = project_summary_table.c
+    project = projects_table.c
+    previous = project_snapshots_table.alias('previous')
+    levels = {
+        'spent': func.coalesce(summary.actual_cost, summary.budget_lines_spent, project.spent, 0),
+        'budget': func.coalesce(summary.budget_allocated, project.budget, 0),
+        'tasks': func.coalesce(summary.tasks, 0),
+        'tasks_completed': func.coalesce(summary.tasks_completed, 0),
+        'open_issues': func.coalesce(summary.open_issues, 0),
+        'open_risks': func.coalesce(summary.open_risks, 0),
+    }
+    query = (
+        select(
+            project.id,
+            func.date(as_of.isoformat()),
+            *levels.values(),
+            *[level - func.coalesce(previous.c[name], 0) for name, level in levels.items()],
+        )
+        .select_from(
+            projects_table
+            .outerjoin(project_summary_table, summary.project_id == project.id)
+            .outerjoin(previous, previous.c.id == _latest_before(as_of))
+        )
+    )
+    if project_ids is not None:
+        query = query.where(project.id.in_(project_ids))
+    return query
+
+
+def _write(executor, rows):
+    columns = ['project_id', 'snapshot_date', *METRICS, *map(_change, METRICS)]
+    statement = insert(project_snapshots_table).from_select(columns, rows)
+    # Later changes on the same day replace that day's row
+    statement = statement.on_conflict_do_update(
+        index_elements=['project_id', 'snapshot_date'],
+        set_={name: statement.excluded[name] for name in columns[2:]},
+    )
+    executor.execute(statement)
+
+
+# Record today's levels for projects touched by an insert into table. Call with the
+# session or connection that did the insert, after project_summary has been updated.
+def record(executor, table, records):
+    if table.name not in TRACKED_TABLES:
+        return
+    project_ids = {record.get('project_id') for record in records} - {None}
+    if project_ids:
+        _write(executor, _snapshot_rows(datetime.date.today(), sorted(project_ids)))
+
+
+# Record every project's levels, e.g. to start the history of an existing database
+def snapshot_all(bind=engine):
+    with bind.begin() as conn:
+        _write(conn, _snapshot_rows(datetime.date.today()))
+
+
+# Start the history once for databases that predate it, from today's levels
+def ensure_started(bind=engine):
+    with bind.connect() as conn:
+        if conn.execute(select(project_snapshots_table.c.id).limit(1)).first():
+            return
+        if not conn.execute(select(projects_table.c.id).limit(1)).first():
+            return
+    snapshot_all(bind)
+
+
+# Summed levels of one project (or all) just before start, and how many projects had any
+def _levels_before(conn, start, project_id=None):
+    snapshots = project_snapshots_table.c
+    query = (
+        select(func.count(), *[func.sum(snapshots[name]) for name in METRICS])
+        .select_from(projects_table)
+        .join(project_snapshots_table, snapshots.id == _latest_before(start))
+    )
+    if project_id is not None:
+        query = query.where(projects_table.c.id == project_id)
+    count, *levels = conn.execute(query).one()
+    return count, levels
+
+
+# Summed changes per day in [start, end], as (date, *METRICS) rows in date order
+def _daily_changes(conn, start, end, project_id=None):
+    snapshots = project_snapshots_table.c
+    query = (
+        select(snapshots.snapshot_date, *[func.sum(snapshots[_change(name)]) for name in METRICS])
+        .where(snapshots.snapshot_date.between(start, end))
+        .group_by(snapshots.snapshot_date)
+        .order_by(snapshots.snapshot_date)
+    )
+    if project_id is not None:
+        query = query.where(snapshots.project_id == project_id)
+    return conn.execute(query).fetchall()
+
+
+# Daily levels from start to end (inclusive), summed over all projects unless project_id
+# is given. Days before the first recorded levels are NaN.
+def load_history(start, end, project_id=None, bind=engine):
+    import numpy as np
+    import pandas as pd
+
+    days = pd.date_range(start, end, freq='D', name='Date')
+    with bind.connect() as conn:
+        count, levels = _levels_before(conn, start, project_id)
+        rows = _daily_changes(conn, start, end, project_id)
+    if not count and not rows:
+        return pd.DataFrame(columns=METRICS, index=days, dtype=float)
+    daily = pd.DataFrame([row[1:] for row in rows], index=pd.to_datetime([row[0] for row in rows]), columns=METRICS, dtype=float)
+    history = daily.reindex(days, fill_value=0.0).cumsum()
+    if count:
+        history += np.array(levels, dtype=float)
+    else:
+        history[history.index < daily.index[0]] = np.nan
+    return history
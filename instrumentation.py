@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from db import engine
+
+# Opt-in per-page performance instrumentation. With BT_INSTRUMENT=1 every page render is
+# timed and the SQLAlchemy cursor events count the queries it runs, the time spent in
+# them and the rows it fetched; figure_cache reports how long figures took to build.
+# Stats are kept per thread, since Streamlit runs each session's script on its own
+# thread. Set BT_INSTRUMENT_LOG to a path to also append one JSON line per render.
+
+ENABLED = os.environ.get("BT_INSTRUMENT", "") not in ("", "0")
+LOG_PATH = os.environ.get("BT_INSTRUMENT_LOG")
+# Comma-separated users who see the panel; everyone when unset
+ADMIN_USERS = [name.strip() for name in os.environ.get("BT_ADMIN_USERS", "").split(",") if name.strip()]
+
+HISTORY_SIZE = 500
+# Statement text kept for the slowest query of each render
+STATEMENT_CHARS = 200
+
+_state = threading.local()
+_history = deque(maxlen=HISTORY_SIZE)
+_history_lock = threading.Lock()
+_log_lock = threading.Lock()
+_installed = set()
+
+
+class PageStats:
+    def __init__(self, section):
+        self.section = section
+        self.started = time.time()
+        self.wall_time = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.rows = 0
+        self.figure_builds = 0
+        self.figure_time = 0.0
+        self.slowest_query = None
+        self.slowest_query_time = 0.0
+
+    def as_record(self):
+        return {
+            'section': self.section,
+            'started': self.started,
+            'wall_ms': round(self.wall_time * 1000, 2),
+            'queries': self.queries,
+            'query_ms': round(self.query_time * 1000, 2),
+            'rows': self.rows,
+            'figure_builds': self.figure_builds,
+            'figure_ms': round(self.figure_time * 1000, 2),
+            'slowest_query': self.slowest_query,
+            'slowest_query_ms': round(self.slowest_query_time * 1000, 2),
+        }
+
+
+def _current():
+    return getattr(_state, 'stats', None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current()
+    started = conn.info.get('query_started')
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats.queries += 1
+    stats.query_time += elapsed
+    if elapsed > stats.slowest_query_time:
+        stats.slowest_query_time = elapsed
+        stats.slowest_query = " ".join(statement.split())[:STATEMENT_CHARS]
+
+
+# sqlite3 calls the row factory once per fetched row, which is the only place every
+# fetch path (fetchall, partitions, scalars...) passes through
+def _count_row(cursor, row):
+    stats = _current()
+    if stats is not None:
+        stats.rows += 1
+    return row
+
+
+def _on_connect(dbapi_connection, connection_record):
+    if hasattr(dbapi_connection, 'row_factory'):
+        dbapi_connection.row_factory = _count_row
+
+
+# Hook the engine's events; connections opened before this don't count fetched rows
+def install(bind=engine):
+    if not ENABLED or bind in _installed:
+        return
+    event.listen(bind, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(bind, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(bind, 'connect', _on_connect)
+    _installed.add(bind)
+
+
+def record_figure_build(seconds):
+    stats = _current()
+    if stats is not None:
+        stats.figure_builds += 1
+        stats.figure_time += seconds
+
+
+def _write_log(record):
+    with _log_lock:
+        with open(LOG_PATH, 'a', encoding='utf-8') as log:
+            log.write(json.dumps(record) + "\n")
+
+
+# Time one page render; a no-op unless instrumentation is enabled
+@contextmanager
+def measure(section):
+    if not ENABLED:
+        yield None
+        return
+    stats = _state.stats = PageStats(section)
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall_time = time.perf_counter() - started
+        _state.stats = None
+        record = stats.as_record()
+        with _history_lock:
+            _history.append(record)
+        if LOG_PATH:
+            _write_log(record)
+
+
+def last_record():
+    with _history_lock:
+        return _history[-1] if _history else None
+
+
+def history():
+    with _history_lock:
+        return list(_history)
+
+
+def clear_history():
+    with _history_lock:
+        _history.clear()
+
+
+def can_view(username):
+    return ENABLED and (not ADMIN_USERS or username in ADMIN_USERS)
@@ -0,0 +1,44 @@
+import argparse
+import sys
+
+import history
+import search
+import summary
+from db import MIGRATION_BATCH, drop_legacy_project_names, init_schema, migrate_project_ids, unmatched_project_names
+
+# Upgrade the database ahead of a deploy. Linking child rows to projects by id happens in
+# short transactions, so the running app keeps serving while this runs; the app would do
+# the same on its first start, but on a large database that start would then be slow.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate the Business Transformation database to the current schema.")
+    parser.add_argument('--batch-size', type=int, default=MIGRATION_BATCH, help="Rows updated per transaction")
+    parser.add_argument('--drop-project-names', action='store_true',
+                        help="Afterwards remove the legacy project_name columns (rewrites each table)")
+    args = parser.parse_args(argv)
+
+    def print_progress(table_name, done, total):
+        print(f"{table_name}: {done}/{total} rows", file=sys.stderr)
+
+    migrate_project_ids(batch_size=args.batch_size, progress=print_progress)
+    init_schema()
+    summary.ensure_built()
+    search.ensure_index()
+    history.ensure_started()
+
+    unmatched = unmatched_project_names()
+    for table_name, count in unmatched.items():
+        print(f"{table_name}: {count} rows name a project that doesn't exist and were left unlinked", file=sys.stderr)
+    if args.drop_project_names:
+        if unmatched:
+            print("error: not dropping project_name while rows are unlinked", file=sys.stderr)
+            return 1
+        for table_name in drop_legacy_project_names():
+            print(f"{table_name}: dropped project_name", file=sys.stderr)
+    print("Database is up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import csv
+import io
+
+from sqlalchemy import and_, func, or_, select
+
+from db import engine, named_select
+
+# Server-side pagination for the per-project table views. Pages are fetched with keyset
+# queries ordered on (sort column, id), so page N costs the same as page 1, and every
+# filter is applied in SQL rather than on a fetched DataFrame.
+
+PAGE_SIZES = [25, 50, 100, 250, 1000]
+
+# Rows per round trip when exporting a whole filtered table
+EXPORT_CHUNKSIZE = 5000
+
+
+# WHERE conditions for a project's rows, optional exact-match filters and a substring search
+def build_conditions(table, project_id, equals=None, search_column=None, search_text=None):
+    conditions = [table.c.project_id == project_id]
+    for name, value in (equals or {}).items():
+        if value is not None:
+            conditions.append(table.c[name] == value)
+    if search_column and search_text:
+        conditions.append(table.c[search_column].contains(search_text, autoescape=True))
+    return conditions
+
+
+def count_rows(table, conditions, bind=engine):
+    with bind.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table).where(*conditions)).scalar_one()
+
+
+# Rows strictly after the cursor (sort value, id) in the requested order. SQLite sorts
+# NULLs first ascending and last descending, which the NULL branches mirror.
+def _after_cursor(column, id_column, cursor, descending):
+    value, last_id = cursor
+    if not descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column > last_id), column.is_not(None))
+        return or_(column > value, and_(column == value, id_column > last_id))
+    if value is None:
+        return and_(column.is_(None), id_column < last_id)
+    return or_(column < value, column.is_(None), and_(column == value, id_column < last_id))
+
+
+def fetch_page(table, conditions, sort_column='id', descending=False, page_size=PAGE_SIZES[0], cursor=None, column_names=None, bind=engine):
+    column = table.c[sort_column]
+    id_column = table.c.id
+    query = named_select(table, column_names).where(*conditions)
+    if cursor is not None:
+        query = query.where(_after_cursor(column, id_column, cursor, descending))
+    if descending:
+        query = query.order_by(column.desc(), id_column.desc())
+    else:
+        query = query.order_by(column.asc(), id_column.asc())
+    with bind.connect() as conn:
+        return conn.execute(query.limit(page_size)).fetchall()
+
+
+# CSV of every row matching the conditions, read in chunks instead of one fetchall()
+def export_csv(table, conditions, header, column_names=None, bind=engine):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    query = named_select(table, column_names).where(*conditions).order_by(table.c.id)
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=EXPORT_CHUNKSIZE).execute(query)
+        for rows in result.partitions():
+            writer.writerows(rows)
+    return buffer.getvalue()
+
+
+# Row counts per combination of the given columns, for charts that summarise a whole table
+def group_counts(table, conditions, column_names, bind=engine):
+    columns = [table.c[name] for name in column_names]
+    query = select(*columns, func.count().label('count')).where(*conditions).group_by(*columns)
+    with bind.connect() as conn:
+        return conn.execute(query).fetchall()
@@ -0,0 +1,133 @@
+import io
+
+from fpdf import FPDF
+from db import engine, named_select
+from report_export import REPORT_SECTIONS
+
+# Rows fetched from the database per round trip while writing a table
+CHUNKSIZE = 2000
+
+# Tables use the fixed-width Courier font: each row is then one pre-padded text run plus a
+# rule underneath, instead of one fpdf cell per value, which is over ten times faster
+FONT_SIZE = 8
+ROW_HEIGHT = 5
+CHAR_WIDTH = 0.6 * FONT_SIZE * 25.4 / 72
+# Rows sampled from the start of a table to size its columns
+WIDTH_SAMPLE_ROWS = 200
+# Longest text, in characters, a column is widened for; longer values are truncated
+MAX_COLUMN_CHARS = 40
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    # Core PDF fonts only cover Latin-1
+    return str(value).encode('latin-1', 'replace').decode('latin-1')
+
+
+class PresentationPDF(FPDF):
+    def header(self):
+        self.set_font("Helvetica", "B", 12)
+        self.cell(0, 10, "Management Presentation", align="C", new_x="LMARGIN", new_y="NEXT")
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("Helvetica", "I", 8)
+        self.cell(0, 10, f"Page {self.page_no()}", align="C")
+
+    def section_title(self, title):
+        self.add_page()
+        self.set_font("Helvetica", "B", 16)
+        self.cell(0, 10, title, align="C", new_x="LMARGIN", new_y="NEXT")
+        self.ln(5)
+
+    # Characters per column: sampled text lengths, scaled down if the row is wider than the page
+    def column_chars(self, headings, sample_rows):
+        lengths = [min(len(heading), MAX_COLUMN_CHARS) for heading in headings]
+        for row in sample_rows:
+            for position, value in enumerate(row):
+                lengths[position] = max(lengths[position], min(len(_text(value)), MAX_COLUMN_CHARS))
+        # One character per column is kept free as the gap between columns
+        available = int(self.epw / CHAR_WIDTH) - len(headings)
+        if sum(lengths) > available:
+            scale = available / sum(lengths)
+            lengths = [max(int(length * scale), 3) for length in lengths]
+        return lengths
+
+    def format_row(self, values, chars):
+        parts = []
+        for value, width in zip(values, chars):
+            if len(value) > width:
+                value = value[:width - 1] + "~"
+            parts.append(value.ljust(width))
+        return " ".join(parts)
+
+    def table_header(self, headings, chars):
+        self.table_top = self.get_y()
+        self.set_font("Courier", "B", FONT_SIZE)
+        self.line(self.l_margin, self.table_top, self.l_margin + self.table_width, self.table_top)
+        self.table_line(self.format_row(headings, chars))
+        self.set_font("Courier", "", FONT_SIZE)
+
+    def table_line(self, text):
+        y = self.get_y()
+        self.text(self.l_margin + CHAR_WIDTH / 2, y + ROW_HEIGHT - 1.5, text)
+        self.line(self.l_margin, y + ROW_HEIGHT, self.l_margin + self.table_width, y + ROW_HEIGHT)
+        self.set_y(y + ROW_HEIGHT)
+
+    # Vertical rules for the part of the table on the current page
+    def close_table_page(self, chars):
+        bottom = self.get_y()
+        x = self.l_margin
+        self.line(x, self.table_top, x, bottom)
+        for width in chars:
+            x += (width + 1) * CHAR_WIDTH
+            self.line(x, self.table_top, x, bottom)
+
+    def start_table(self, headings, chars):
+        self.table_width = (sum(chars) + len(chars)) * CHAR_WIDTH
+        self.table_header(headings, chars)
+
+    def table_rows(self, rows, headings, chars):
+        for row in rows:
+            if self.get_y() + ROW_HEIGHT > self.page_break_trigger:
+                self.close_table_page(chars)
+                self.add_page()
+                self.table_header(headings, chars)
+            self.table_line(self.format_row([_text(value) for value in row], chars))
+
+    def chart_page(self, title, png):
+        self.section_title(title)
+        self.image(io.BytesIO(png), x=10, y=30, w=self.w - 20)
+
+
+# Stream one table from the database into the PDF, a chunk of rows at a time
+def add_table_section(pdf, title, table, headings, bind=engine):
+    pdf.section_title(title)
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=CHUNKSIZE).execute(named_select(table).order_by(table.c.id))
+        chars = None
+        for rows in result.partitions():
+            if chars is None:
+                chars = pdf.column_chars(headings, rows[:WIDTH_SAMPLE_ROWS])
+                pdf.start_table(headings, chars)
+            pdf.table_rows(rows, headings, chars)
+    if chars is None:
+        pdf.set_font("Helvetica", "", 12)
+        pdf.cell(0, 10, "No data available", new_x="LMARGIN", new_y="NEXT")
+    else:
+        pdf.close_table_page(chars)
+
+
+# Whole presentation as PDF bytes. charts maps a page title to PNG bytes.
+# Landscape pages give wide tables such as projects room for every column.
+def build_presentation(charts=None, sections=REPORT_SECTIONS, bind=engine):
+    pdf = PresentationPDF(orientation="L", format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+    for title, table, headings in sections:
+        add_table_section(pdf, title, table, headings, bind)
+    for title, png in (charts or {}).items():
+        pdf.chart_page(title, png)
+    return bytes(pdf.output())
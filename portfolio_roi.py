@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import Integer, cast, select
+
+import analytics
+import finance
+from db import engine, cash_flows_table, projects_table
+
+# Portfolio ROI ranking: every project's cash-flow series is pivoted into one row of a
+# (projects x periods) matrix, and IRR, NPV, payback and ROI are computed for all rows in
+# a single vectorised pass.
+
+
+# Returns (project names, matrix) with periods missing from a series counted as zero.
+# Rows whose period isn't a whole number from 0 up (possible in databases written before
+# imports checked it) are left out rather than landing in the wrong column.
+def load_cash_flow_matrix(bind=engine):
+    period = cash_flows_table.c.period
+    query = (
+        select(cash_flows_table.c.project_id, projects_table.c.name, period, cash_flows_table.c.amount)
+        .join(projects_table, projects_table.c.id == cash_flows_table.c.project_id)
+        .where(period >= 0, period == cast(period, Integer))
+    )
+    flows = analytics.fetch_frame(query, ['project_id', 'project_name', 'period', 'amount'], bind)
+    if flows.empty:
+        return [], np.zeros((0, 0))
+
+    # Rows are grouped on the id; two projects may share a name
+    codes, project_ids = pd.factorize(flows['project_id'])
+    names = flows['project_name'].to_numpy()[np.unique(codes, return_index=True)[1]]
+    periods = flows['period'].to_numpy(dtype=int)
+    matrix = np.zeros((len(project_ids), periods.max() + 1))
+    np.add.at(matrix, (codes, periods), flows['amount'].fillna(0).to_numpy(dtype=float))
+    return list(names), matrix
+
+
+ROI_COLUMNS = ['Project Name', 'Investment', 'Total Return', 'NPV', 'IRR', 'ROI', 'Payback Period']
+
+
+def compute_portfolio_roi(names, matrix, discount_rate=0.1):
+    if not len(names):
+        return pd.DataFrame(columns=ROI_COLUMNS)
+    metrics = pd.DataFrame({
+        'Project Name': names,
+        'Investment': -matrix[:, 0],
+        'Total Return': matrix[:, 1:].sum(axis=1),
+        'NPV': finance.npv(discount_rate, matrix),
+        'IRR': finance.irr(matrix),
+        'ROI': finance.roi(matrix),
+        'Payback Period': finance.payback_period(matrix),
+    }, columns=ROI_COLUMNS)
+    return metrics.sort_values('IRR', ascending=False, na_position='last').reset_index(drop=True)
+
+
+def portfolio_roi(discount_rate=0.1, bind=engine):
+    names, matrix = load_cash_flow_matrix(bind)
+    return compute_portfolio_roi(names, matrix, discount_rate)
+
+
+# Replace a project's stored series with the given amounts for periods 0, 1, 2, ...
+def save_cash_flows(session, project_id, amounts):
+    session.execute(cash_flows_table.delete().where(cash_flows_table.c.project_id == project_id))
+    session.execute(cash_flows_table.insert(), [
+        {'project_id': project_id, 'period': period, 'amount': amount}
+        for period, amount in enumerate(amounts)
+    ])
+    session.commit()
@@ -0,0 +1,166 @@
+import argparse
+import csv
+import io
+import sys
+import zipfile
+
+from sqlalchemy import func, literal, select, union_all
+
+import analytics
+from db import (
+    engine, init_schema, named_select, projects_table, tasks_table, risks_table, budget_table, resources_table,
+    issues_table, milestones_table, charter_table, costs_table, todos_table, portfolio_table,
+    calendar_table, cost_estimations_table
+)
+
+# Report sections in presentation order: (title, table, column headings)
+REPORT_SECTIONS = [
+    ("Dashboard", projects_table, ['id', 'Project Name', 'Start Date', 'End Date', 'Budget', 'Spent', 'Status', 'Portfolio', 'Impact on Business', 'Deliverable', 'Timeline']),
+    ("Tasks", tasks_table, ['id', 'Project Name', 'Task', 'Priority', 'Status', 'Start Date', 'End Date']),
+    ("Risks", risks_table, ['id', 'Project Name', 'Risk', 'Likelihood', 'Impact', 'Severity', 'Status']),
+    ("Budget", budget_table, ['id', 'Project Name', 'Category', 'Allocated', 'Spent']),
+    ("Resources", resources_table, ['id', 'Project Name', 'Resource Name', 'Allocation']),
+    ("Issues", issues_table, ['id', 'Project Name', 'Description', 'Priority', 'Status']),
+    ("Milestones", milestones_table, ['id', 'Project Name', 'Milestone', 'Due Date', 'Status']),
+    ("Charter", charter_table, ['id', 'Project Name', 'Objective', 'Scope', 'Stakeholders']),
+    ("Costs", costs_table, ['id', 'Project Name', 'Category', 'Planned Cost', 'Actual Cost', 'Status']),
+    ("To-Dos", todos_table, ['id', 'Project Name', 'Task', 'Priority', 'Status', 'Due Date']),
+    ("Portfolio", portfolio_table, ['id', 'Project Name', 'Portfolio Type']),
+    ("Calendar", calendar_table, ['id', 'Project Name', 'Event Name', 'Event Date']),
+    ("Cost Estimations", cost_estimations_table, ['id', 'Project Name', 'Item', 'Estimated Cost']),
+]
+
+EXPORT_FORMATS = {
+    'xlsx': ("Excel workbook (one sheet per table)", "full_report.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'csv': ("Zip of CSV files", "full_report_csv.zip", "application/zip"),
+    'parquet': ("Zip of Parquet files", "full_report_parquet.zip", "application/zip"),
+}
+
+# Rows fetched from the database per round trip; exports never hold more than this in memory
+CHUNKSIZE = 5000
+
+# Excel's row limit, less the header row; longer tables continue on a numbered sheet
+XLSX_MAX_ROWS = 1048575
+
+
+# Row count of every report table in one UNION ALL query
+def table_counts(sections=REPORT_SECTIONS, bind=engine):
+    query = union_all(*[
+        select(literal(title).label('section'), func.count().label('rows')).select_from(table)
+        for title, table, _ in sections
+    ])
+    return dict(analytics.fetch_all(query, bind))
+
+
+# Yield lists of rows from a table, CHUNKSIZE at a time
+def iter_table_chunks(table, bind=engine):
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=CHUNKSIZE).execute(named_select(table).order_by(table.c.id))
+        for rows in result.partitions():
+            yield rows
+
+
+def write_csv_zip(target, sections=REPORT_SECTIONS, bind=engine):
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for title, table, headings in sections:
+            with archive.open(f"{table.name}.csv", 'w') as entry:
+                text = io.TextIOWrapper(entry, encoding='utf-8', newline='')
+                writer = csv.writer(text)
+                writer.writerow(headings)
+                for rows in iter_table_chunks(table, bind):
+                    writer.writerows(rows)
+                text.flush()
+                text.detach()
+
+
+def write_xlsx(target, sections=REPORT_SECTIONS, bind=engine):
+    import xlsxwriter
+
+    # constant_memory flushes each row to disk as it is written instead of keeping the sheet
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd'})
+    header_format = workbook.add_format({'bold': True})
+
+    def new_sheet(title, part, headings):
+        name = title if part == 1 else f"{title} ({part})"
+        sheet = workbook.add_worksheet(name[:31])
+        sheet.write_row(0, 0, headings, header_format)
+        return sheet
+
+    for title, table, headings in sections:
+        part = 1
+        sheet = new_sheet(title, part, headings)
+        row_number = 0
+        for rows in iter_table_chunks(table, bind):
+            for row in rows:
+                if row_number == XLSX_MAX_ROWS:
+                    part += 1
+                    sheet = new_sheet(title, part, headings)
+                    row_number = 0
+                row_number += 1
+                sheet.write_row(row_number, 0, row)
+    workbook.close()
+
+
+def _arrow_schema(table, headings):
+    import pyarrow as pa
+
+    return pa.schema([(heading, analytics.arrow_type(column)) for heading, column in zip(headings, named_select(table).selected_columns)])
+
+
+# One Parquet file per table, each chunk written as its own row group
+def write_parquet_zip(target, sections=REPORT_SECTIONS, bind=engine):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_STORED) as archive:
+        for title, table, headings in sections:
+            schema = _arrow_schema(table, headings)
+            with archive.open(f"{table.name}.parquet", 'w') as entry:
+                with pq.ParquetWriter(entry, schema) as writer:
+                    wrote_rows = False
+                    for rows in iter_table_chunks(table, bind):
+                        columns = list(zip(*rows))
+                        writer.write_table(pa.Table.from_arrays(
+                            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                            schema=schema
+                        ))
+                        wrote_rows = True
+                    if not wrote_rows:
+                        writer.write_table(schema.empty_table())
+
+
+WRITERS = {
+    'xlsx': write_xlsx,
+    'csv': write_csv_zip,
+    'parquet': write_parquet_zip,
+}
+
+
+# Write the full report to a path or binary file object
+def export_report(target, export_format, sections=REPORT_SECTIONS, bind=engine):
+    if export_format not in WRITERS:
+        raise ValueError(f"Unknown export format '{export_format}'")
+    WRITERS[export_format](target, sections, bind)
+
+
+def export_report_bytes(export_format, sections=REPORT_SECTIONS, bind=engine):
+    buffer = io.BytesIO()
+    export_report(buffer, export_format, sections, bind)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export every Business Transformation table to one report file.")
+    parser.add_argument('format', choices=sorted(WRITERS), help="Report format")
+    parser.add_argument('output', help="File to write")
+    args = parser.parse_args(argv)
+
+    init_schema()
+    export_report(args.output, args.format)
+    counts = table_counts()
+    print(f"Wrote {sum(counts.values())} rows from {len(counts)} tables to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import numpy as np
+from sqlalchemy import select
+
+import analytics
+from db import engine, named_select, risks_table
+
+# Portfolio-wide risk exposure: every risk binned into a likelihood x impact grid with
+# np.histogram2d, plus the highest-severity risks read through the severity index.
+
+GRID_BINS = 5
+RISK_STATUSES = ["Open", "Mitigated", "Closed"]
+
+
+# Likelihood, impact and severity columns for all risks, optionally for one status only
+def load_risk_points(status=None, bind=engine):
+    query = select(risks_table.c.likelihood, risks_table.c.impact, risks_table.c.severity)
+    if status:
+        query = query.where(risks_table.c.status == status)
+    rows = analytics.fetch_all(query, bind)
+    if not rows:
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+    points = np.array([tuple(row) for row in rows], dtype=float)
+    points = points[~np.isnan(points[:, :2]).any(axis=1)]
+    return points[:, 0], points[:, 1], np.nan_to_num(points[:, 2])
+
+
+# Counts and summed severity per cell; rows are impact bins and columns likelihood bins
+def risk_heatmap(likelihood, impact, severity, bins=GRID_BINS):
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    counts, _, _ = np.histogram2d(impact, likelihood, bins=[edges, edges])
+    exposure, _, _ = np.histogram2d(impact, likelihood, bins=[edges, edges], weights=severity)
+    return edges, counts, exposure
+
+
+def top_exposures(limit=20, status=None, bind=engine):
+    query = named_select(risks_table).order_by(risks_table.c.severity.desc()).limit(limit)
+    if status:
+        query = query.where(risks_table.c.status == status)
+    with bind.connect() as conn:
+        return conn.execute(query).fetchall()
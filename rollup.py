@@ -0,0 +1,141 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+
+import analytics
+from db import engine, projects_table, budget_table, costs_table
+
+# Earned value management for every project at once.
+#
+# BAC (budget at completion) is the sum of the project's budget lines, falling back to
+# projects.budget when none are recorded. PV assumes the budget is spent linearly between
+# the project's start and end dates. Each cost entry is treated as a completed work
+# package, so EV is the sum of planned_cost and AC the sum of actual_cost; without cost
+# entries AC falls back to the spent figures from budget lines or the project itself.
+
+EVM_COLUMNS = ['BAC', 'PV', 'EV', 'AC', 'CV', 'SV', 'CPI', 'SPI', 'EAC', 'ETC', 'VAC']
+
+
+def load_evm_inputs(bind=engine):
+    budget_totals = (
+        select(
+            budget_table.c.project_id,
+            func.sum(budget_table.c.allocated).label('allocated'),
+            func.sum(budget_table.c.spent).label('budget_spent'),
+        )
+        .group_by(budget_table.c.project_id)
+        .subquery()
+    )
+    cost_totals = (
+        select(
+            costs_table.c.project_id,
+            func.sum(costs_table.c.planned_cost).label('planned_cost'),
+            func.sum(costs_table.c.actual_cost).label('actual_cost'),
+        )
+        .group_by(costs_table.c.project_id)
+        .subquery()
+    )
+    query = (
+        select(
+            projects_table.c.id,
+            projects_table.c.name,
+            projects_table.c.portfolio,
+            projects_table.c.status,
+            projects_table.c.start_date,
+            projects_table.c.end_date,
+            projects_table.c.budget,
+            projects_table.c.spent,
+            budget_totals.c.allocated,
+            budget_totals.c.budget_spent,
+            cost_totals.c.planned_cost,
+            cost_totals.c.actual_cost,
+        )
+        .select_from(projects_table)
+        .outerjoin(budget_totals, budget_totals.c.project_id == projects_table.c.id)
+        .outerjoin(cost_totals, cost_totals.c.project_id == projects_table.c.id)
+        .order_by(projects_table.c.id)
+    )
+    return analytics.fetch_frame(query, [
+        'id', 'name', 'portfolio', 'status', 'start_date', 'end_date', 'budget', 'spent',
+        'allocated', 'budget_spent', 'planned_cost', 'actual_cost'
+    ], bind)
+
+
+def _first_valid(*arrays):
+    result = arrays[0].copy()
+    for fallback in arrays[1:]:
+        result = np.where(np.isnan(result), fallback, result)
+    return result
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / denominator, np.nan)
+
+
+# Derived metrics from BAC/PV/EV/AC arrays; works for projects and for summed portfolios
+def evm_metrics(bac, pv, ev, ac):
+    cpi = _ratio(ev, ac)
+    spi = _ratio(ev, pv)
+    eac = _ratio(bac, cpi)
+    return {
+        'BAC': bac,
+        'PV': pv,
+        'EV': ev,
+        'AC': ac,
+        'CV': ev - ac,
+        'SV': ev - pv,
+        'CPI': cpi,
+        'SPI': spi,
+        'EAC': eac,
+        'ETC': eac - ac,
+        'VAC': bac - eac,
+    }
+
+
+def compute_project_evm(inputs, as_of=None):
+    as_of = np.datetime64(as_of or datetime.date.today(), 'D')
+
+    def as_float(name):
+        return pd.to_numeric(inputs[name], errors='coerce').to_numpy(dtype=float)
+
+    bac = _first_valid(as_float('allocated'), as_float('budget'), np.zeros(len(inputs)))
+    ev = np.nan_to_num(as_float('planned_cost'))
+    ac = _first_valid(as_float('actual_cost'), as_float('budget_spent'), as_float('spent'), np.zeros(len(inputs)))
+
+    start = pd.to_datetime(inputs['start_date']).to_numpy(dtype='datetime64[D]')
+    end = pd.to_datetime(inputs['end_date']).to_numpy(dtype='datetime64[D]')
+    duration = (end - start).astype(float)
+    elapsed = (as_of - start).astype(float)
+    # Zero-length projects are fully planned once they start; projects without dates plan nothing
+    planned_fraction = np.where(duration > 0, _ratio(elapsed, duration), np.where(elapsed >= 0, 1.0, 0.0))
+    planned_fraction = np.nan_to_num(np.clip(planned_fraction, 0.0, 1.0))
+    pv = bac * planned_fraction
+
+    metrics = pd.DataFrame(evm_metrics(bac, pv, ev, ac), columns=EVM_COLUMNS)
+    metrics.insert(0, 'Status', inputs['status'].to_numpy())
+    metrics.insert(0, 'Portfolio', inputs['portfolio'].to_numpy())
+    metrics.insert(0, 'Project Name', inputs['name'].to_numpy())
+    return metrics
+
+
+def compute_portfolio_evm(project_evm):
+    codes, portfolios = pd.factorize(project_evm['Portfolio'].fillna('Unassigned'))
+    totals = {
+        name: np.bincount(codes, weights=project_evm[name].to_numpy(), minlength=len(portfolios))
+        for name in ['BAC', 'PV', 'EV', 'AC']
+    }
+    # Append an all-projects row by summing the per-portfolio totals
+    for name in totals:
+        totals[name] = np.append(totals[name], totals[name].sum())
+    metrics = pd.DataFrame(evm_metrics(totals['BAC'], totals['PV'], totals['EV'], totals['AC']), columns=EVM_COLUMNS)
+    metrics.insert(0, 'Projects', np.append(np.bincount(codes, minlength=len(portfolios)), len(codes)))
+    metrics.insert(0, 'Portfolio', list(portfolios) + ['All Projects'])
+    return metrics
+
+
+def portfolio_rollup(as_of=None, bind=engine):
+    project_evm = compute_project_evm(load_evm_inputs(bind), as_of)
+    return project_evm, compute_portfolio_evm(project_evm)
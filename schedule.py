@@ -0,0 +1,144 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+import analytics
+from db import engine, named_select, tasks_table, task_dependencies_table
+
+# Critical path method over a project's tasks and finish-to-start dependencies.
+#
+# Dates are whole days. A task's duration is end_date - start_date and its planned start is
+# a "start no earlier than" constraint, so without dependencies the schedule is the plan.
+# Tasks are ordered with Kahn's algorithm; the forward pass runs in that order and the
+# backward pass in reverse, so the whole calculation is O(tasks + dependencies).
+
+SCHEDULE_COLUMNS = ['Early Start', 'Early Finish', 'Late Start', 'Late Finish', 'Float', 'Critical', 'Slip (days)']
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+def load_schedule_inputs(project_id, bind=engine):
+    with bind.connect() as conn:
+        tasks = conn.execute(named_select(tasks_table).where(tasks_table.c.project_id == project_id).order_by(tasks_table.c.id)).fetchall()
+        dependencies = conn.execute(
+            select(task_dependencies_table.c.task_id, task_dependencies_table.c.depends_on_id)
+            .where(task_dependencies_table.c.project_id == project_id)
+        ).fetchall()
+    task_df = pd.DataFrame(tasks, columns=['id', 'Project Name', 'Task', 'Priority', 'Status', 'Start Date', 'End Date'])
+    return task_df, [tuple(row) for row in dependencies]
+
+
+# Task positions in dependency order; raises ScheduleError naming the tasks on a cycle
+def topological_order(task_ids, successors, in_degree):
+    in_degree = list(in_degree)
+    ready = deque(position for position, degree in enumerate(in_degree) if degree == 0)
+    order = []
+    while ready:
+        position = ready.popleft()
+        order.append(position)
+        for successor in successors[position]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                ready.append(successor)
+    if len(order) < len(task_ids):
+        blocked = [task_ids[position] for position, degree in enumerate(in_degree) if degree > 0]
+        raise ScheduleError(f"Task dependencies form a cycle through tasks {blocked[:10]}")
+    return order
+
+
+# CPM over tasks (DataFrame with id, Start Date, End Date) and (task_id, depends_on_id)
+# pairs. Returns the tasks with SCHEDULE_COLUMNS added; dependencies on tasks that aren't
+# in task_df are ignored.
+def compute_schedule(task_df, dependencies):
+    result = task_df.copy()
+    if result.empty:
+        for column in SCHEDULE_COLUMNS:
+            result[column] = pd.Series(dtype=object)
+        return result
+
+    starts = analytics.to_days(result['Start Date'])
+    ends = analytics.to_days(result['End Date'])
+    anchor = starts[~np.isnat(starts)].min() if (~np.isnat(starts)).any() else np.datetime64('today', 'D')
+    starts = np.where(np.isnat(starts), anchor, starts)
+    ends = np.where(np.isnat(ends), starts, ends)
+    # Integer day offsets from the anchor keep the passes on plain Python ints
+    planned_start = (starts - anchor).astype(np.int64).tolist()
+    planned_finish = (ends - anchor).astype(np.int64).tolist()
+    durations = [max(finish - start, 0) for start, finish in zip(planned_start, planned_finish)]
+
+    task_ids = result['id'].tolist()
+    positions = {task_id: position for position, task_id in enumerate(task_ids)}
+    successors = [[] for _ in task_ids]
+    in_degree = [0] * len(task_ids)
+    for task_id, depends_on_id in dependencies:
+        task, predecessor = positions.get(task_id), positions.get(depends_on_id)
+        if task is None or predecessor is None:
+            continue
+        successors[predecessor].append(task)
+        in_degree[task] += 1
+
+    order = topological_order(task_ids, successors, in_degree)
+
+    early_start = list(planned_start)
+    early_finish = [0] * len(task_ids)
+    for position in order:
+        finish = early_finish[position] = early_start[position] + durations[position]
+        for successor in successors[position]:
+            if finish > early_start[successor]:
+                early_start[successor] = finish
+
+    project_finish = max(early_finish)
+    late_finish = [project_finish] * len(task_ids)
+    late_start = [0] * len(task_ids)
+    for position in reversed(order):
+        for successor in successors[position]:
+            if late_start[successor] < late_finish[position]:
+                late_finish[position] = late_start[successor]
+        late_start[position] = late_finish[position] - durations[position]
+
+    early_start = np.array(early_start)
+    early_finish = np.array(early_finish)
+    late_start = np.array(late_start)
+    late_finish = np.array(late_finish)
+    total_float = late_start - early_start
+
+    def to_date(offsets):
+        return (anchor + offsets.astype('timedelta64[D]')).astype(object)
+
+    result['Early Start'] = to_date(early_start)
+    result['Early Finish'] = to_date(early_finish)
+    result['Late Start'] = to_date(late_start)
+    result['Late Finish'] = to_date(late_finish)
+    result['Float'] = total_float
+    result['Critical'] = total_float == 0
+    result['Slip (days)'] = early_finish - np.array(planned_finish)
+    return result
+
+
+# Whether making task_id depend on depends_on_id would close a loop, i.e. depends_on_id
+# is already downstream of task_id
+def creates_cycle(dependencies, task_id, depends_on_id):
+    if task_id == depends_on_id:
+        return True
+    successors = {}
+    for task, predecessor in dependencies:
+        successors.setdefault(predecessor, []).append(task)
+    seen = {task_id}
+    pending = [task_id]
+    while pending:
+        for successor in successors.get(pending.pop(), ()):
+            if successor == depends_on_id:
+                return True
+            if successor not in seen:
+                seen.add(successor)
+                pending.append(successor)
+    return False
+
+
+def project_schedule(project_id, bind=engine):
+    task_df, dependencies = load_schedule_inputs(project_id, bind)
+    return compute_schedule(task_df, dependencies)
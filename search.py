@@ -0,0 +1,136 @@
+import logging
+import re
+import threading
+import weakref
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from db import engine, issues_table, risks_table, charter_table, tasks_table, todos_table, milestones_table
+
+# Global full-text search over the free-text columns of every project, backed by an
+# SQLite FTS5 table. Triggers on the source tables keep it in sync with every insert,
+# update and delete, whichever path wrote the row (forms, the write queue, bulk import,
+# the project_id migration). Each indexed row's FTS rowid is source id * len(SOURCES) +
+# its source's position below, so triggers find their entry by rowid rather than by
+# scanning, and a hit maps straight back to its table and id.
+
+INDEX_TABLE = "search_index"
+SEARCH_LIMIT = 50
+# Words of context shown around the matched terms
+SNIPPET_WORDS = 12
+
+# (kind, label, table, columns); append new sources at the end, since positions are
+# baked into the rowids of an existing index
+SOURCES = [
+    ('issues', "Issue", issues_table, ['description']),
+    ('risks', "Risk", risks_table, ['risk']),
+    ('charter', "Charter", charter_table, ['objective', 'scope', 'stakeholders']),
+    ('tasks', "Task", tasks_table, ['task']),
+    ('todos', "To-Do", todos_table, ['task']),
+    ('milestones', "Milestone", milestones_table, ['milestone']),
+]
+
+SEARCH_COLUMNS = ['kind', 'id', 'project_id', 'project_name', 'snippet', 'rank']
+
+logger = logging.getLogger(__name__)
+
+_index_ready = weakref.WeakSet()
+_index_lock = threading.Lock()
+
+
+def _body(prefix, columns):
+    return " || ' ' || ".join(f"coalesce({prefix}.{column}, '')" for column in columns)
+
+
+def _rowid(prefix, position):
+    return f"{prefix}.id * {len(SOURCES)} + {position}"
+
+
+def _trigger_statements(position, table, columns):
+    insert = (
+        f"INSERT INTO {INDEX_TABLE} (rowid, body, project_id) "
+        f"VALUES ({_rowid('new', position)}, {_body('new', columns)}, new.project_id);"
+    )
+    delete = f"DELETE FROM {INDEX_TABLE} WHERE rowid = {_rowid('old', position)};"
+    name = f"{INDEX_TABLE}_{table.name}"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {table.name} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_update AFTER UPDATE ON {table.name} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {table.name} BEGIN {delete} END",
+    ]
+
+
+def _backfill(conn):
+    for position, (_, _, table, columns) in enumerate(SOURCES):
+        conn.exec_driver_sql(
+            f"INSERT INTO {INDEX_TABLE} (rowid, body, project_id) "
+            f"SELECT {_rowid(table.name, position)}, {_body(table.name, columns)}, project_id FROM {table.name}"
+        )
+
+
+# Create the index and its triggers, filling it from the existing rows the first time.
+# Call after db.init_schema(). Returns False when this SQLite build has no FTS5.
+def ensure_index(bind=engine):
+    with _index_lock:
+        if bind in _index_ready:
+            return True
+        try:
+            with bind.begin() as conn:
+                exists = conn.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (INDEX_TABLE,)
+                ).first()
+                if not exists:
+                    conn.exec_driver_sql(
+                        f"CREATE VIRTUAL TABLE {INDEX_TABLE} USING fts5(body, project_id UNINDEXED, tokenize = 'porter unicode61')"
+                    )
+                for position, (_, _, table, columns) in enumerate(SOURCES):
+                    for statement in _trigger_statements(position, table, columns):
+                        conn.exec_driver_sql(statement)
+                if not exists:
+                    _backfill(conn)
+        except OperationalError as exc:
+            if 'fts5' not in str(exc):
+                raise
+            logger.warning("SQLite was built without FTS5; global search is disabled")
+            return False
+        _index_ready.add(bind)
+        return True
+
+
+# Rebuild the index from the source tables, e.g. after restoring a backup without it
+def rebuild(bind=engine):
+    ensure_index(bind)
+    with bind.begin() as conn:
+        conn.exec_driver_sql(f"DELETE FROM {INDEX_TABLE}")
+        _backfill(conn)
+
+
+# FTS5 query for free text typed by a user: every word must match, the last one as a
+# prefix so results show up while typing. Operators and quotes are not passed through.
+def match_query(search_text):
+    words = re.findall(r"\w+", search_text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+# Best-ranked hits across all projects (or one), as rows of SEARCH_COLUMNS where kind is
+# the source table's name. The snippet marks matched terms with [ ].
+def search(search_text, project_id=None, limit=SEARCH_LIMIT, bind=engine):
+    query = match_query(search_text)
+    if query is None or not ensure_index(bind):
+        return []
+    statement = (
+        f"SELECT {INDEX_TABLE}.rowid % {len(SOURCES)}, {INDEX_TABLE}.rowid / {len(SOURCES)}, {INDEX_TABLE}.project_id, projects.name, "
+        f"snippet({INDEX_TABLE}, 0, '[', ']', '…', {SNIPPET_WORDS}), bm25({INDEX_TABLE}) AS rank "
+        f"FROM {INDEX_TABLE} LEFT JOIN projects ON projects.id = {INDEX_TABLE}.project_id "
+        f"WHERE {INDEX_TABLE} MATCH :query"
+    )
+    parameters = {'query': query, 'limit': limit}
+    if project_id is not None:
+        statement += f" AND {INDEX_TABLE}.project_id = :project_id"
+        parameters['project_id'] = project_id
+    with bind.connect() as conn:
+        rows = conn.execute(text(statement + " ORDER BY rank LIMIT :limit"), parameters).fetchall()
+    return [(SOURCES[position][0], source_id, *rest) for position, source_id, *rest in rows]
@@ -0,0 +1,82 @@
+import importlib
+
+import instrumentation
+
+# App pages, one module per area. A module is imported the first time one of its pages is
+# opened, so heavy dependencies (fpdf and kaleido for the presentation, numpy_financial for
+# ROI) only load for the users who need them, and never on the login screen.
+
+# Sidebar navigation: category -> sections, in display order
+CATEGORIES = {
+    "Project Initiation": [
+        "Dashboard",
+        "Executive Overview",
+        "Project Charter",
+        "Project Milestones",
+        "Portfolio Tracking",
+        "Bulk Import"
+    ],
+    "Project Planning": [
+        "Project Schedule",
+        "Task Management",
+        "Gantt Chart",
+        "Burn Charts",
+        "Resource Tracking",
+        "Risk Management"
+    ],
+    "Budgeting and Costing": [
+        "Budget Management",
+        "Cost Management",
+        "Cost Estimation",
+        "ROI Calculation"
+    ],
+    "Change Management": [
+        "Issue Management",
+        "To-Do List",
+        "Project Calendar",
+        "Reporting",
+        "Make Presentation",
+        "Training and Development",
+        "Visualizations"
+    ]
+}
+
+# Section -> (module in this package, page function)
+PAGES = {
+    "Dashboard": ("projects", "dashboard"),
+    "Executive Overview": ("projects", "executive_overview"),
+    "Project Charter": ("projects", "project_charter"),
+    "Project Milestones": ("projects", "project_milestones"),
+    "Portfolio Tracking": ("projects", "portfolio_tracking"),
+    "Bulk Import": ("data_import", "bulk_import_page"),
+    "Project Schedule": ("planning", "project_schedule"),
+    "Task Management": ("planning", "task_management"),
+    "Gantt Chart": ("planning", "gantt_chart"),
+    "Burn Charts": ("planning", "burn_charts"),
+    "Resource Tracking": ("planning", "resource_tracking"),
+    "Risk Management": ("risks", "risk_management"),
+    "Budget Management": ("costs", "budget_management"),
+    "Cost Management": ("costs", "cost_management"),
+    "Cost Estimation": ("costs", "cost_estimation"),
+    "ROI Calculation": ("roi", "roi_calculation"),
+    "Issue Management": ("tracking", "issue_management"),
+    "To-Do List": ("tracking", "todo_list"),
+    "Project Calendar": ("tracking", "project_calendar"),
+    "Reporting": ("reports", "reporting"),
+    "Make Presentation": ("presentation", "make_presentation"),
+    "Training and Development": ("training", "training_and_development"),
+    "Visualizations": ("projects", "visualizations"),
+    # Not in CATEGORIES: shown while the sidebar search box has text
+    "Search": ("search", "search_page"),
+}
+
+
+def page(section):
+    module_name, function_name = PAGES[section]
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, function_name)
+
+
+def render(section):
+    with instrumentation.measure(section):
+        page(section)()
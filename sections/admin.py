@@ -0,0 +1,39 @@
+import streamlit as st
+import pandas as pd
+
+import instrumentation
+
+
+# Sidebar panel with this rerun's page stats and per-section averages over recent renders
+def instrumentation_panel():
+    with st.sidebar.expander("Admin: Performance", expanded=False):
+        record = instrumentation.last_record()
+        if record is None:
+            st.write("No page renders recorded yet.")
+            return
+
+        st.markdown(f"**Last render: {record['section']}**")
+        col1, col2 = st.columns(2)
+        col1.metric("Wall Time (ms)", f"{record['wall_ms']:,.0f}")
+        col2.metric("Queries", record['queries'])
+        col1.metric("Query Time (ms)", f"{record['query_ms']:,.0f}")
+        col2.metric("Rows Fetched", f"{record['rows']:,}")
+        col1.metric("Figure Time (ms)", f"{record['figure_ms']:,.0f}")
+        col2.metric("Figures", record['figure_builds'])
+        if record['slowest_query']:
+            st.caption(f"Slowest query ({record['slowest_query_ms']:,.1f} ms): {record['slowest_query']}")
+
+        history_df = pd.DataFrame(instrumentation.history())
+        by_section = history_df.groupby('section').agg(
+            renders=('wall_ms', 'size'),
+            mean_ms=('wall_ms', 'mean'),
+            p95_ms=('wall_ms', lambda values: values.quantile(0.95)),
+            queries=('queries', 'mean'),
+            rows=('rows', 'mean'),
+            figure_ms=('figure_ms', 'mean'),
+        ).round(1).sort_values('mean_ms', ascending=False)
+        st.markdown("**Recent renders by section**")
+        st.dataframe(by_section)
+        if instrumentation.LOG_PATH:
+            st.caption(f"Appending every render to {instrumentation.LOG_PATH}")
+        st.button("Clear History", on_click=instrumentation.clear_history)
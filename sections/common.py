@@ -0,0 +1,54 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from sqlalchemy import select
+
+import analytics
+import figure_cache
+from db import Session, engine, projects_table
+
+# Pages talk to the database through the scoped_session registry, which proxies each call
+# to the current thread's session; app.py replaces that session at the start of every run
+session = Session
+
+
+# Project id -> name for the "Select Project Name" boxes, shared by every page and session.
+# Only the id and name columns are read; dashboard() clears the cache when it writes a project.
+@st.cache_data
+def get_projects():
+    with engine.connect() as conn:
+        return dict(conn.execute(select(projects_table.c.id, projects_table.c.name).order_by(projects_table.c.id)).fetchall())
+
+
+# Project picker returning the selected project's id; rows link to projects by id, so two
+# projects sharing a name stay apart
+def select_project(label="Select Project Name", key=None):
+    projects = get_projects()
+    return st.selectbox(label, list(projects), format_func=projects.get, key=key)
+
+
+# Projects as a DataFrame, rebuilt only when the projects table version changes
+@st.cache_data(max_entries=4)
+def load_project_df(version):
+    project_df = analytics.fetch_frame(projects_table.select(), ['id', 'Project Name', 'Start Date', 'End Date', 'Budget', 'Spent', 'Status', 'Portfolio', 'Impact on Business', 'Deliverable', 'Timeline'])
+    project_df['Start Date'] = pd.to_datetime(project_df['Start Date'])
+    project_df['End Date'] = pd.to_datetime(project_df['End Date'])
+    return project_df
+
+
+# The four project overview charts shared by the dashboard and visualizations pages
+def project_overview_figures(version, project_df):
+    def build():
+        fig_project_status = px.timeline(project_df, x_start="Start Date", x_end="End Date", y="Project Name", color="Status", title="Project Timelines and Status")
+        fig_project_status.update_yaxes(categoryorder="total ascending")
+        fig_budget_vs_spent = px.bar(project_df, x='Project Name', y=['Budget', 'Spent'], barmode='group', title="Budget vs Spent")
+        fig_pie = px.pie(project_df, names='Status', title="Project Status Distribution")
+        fig_scatter = px.scatter(project_df, x='Budget', y='Spent', color='Status', size='Spent', title="Budget vs Spent by Status")
+        return {
+            'timeline': fig_project_status,
+            'budget_vs_spent': fig_budget_vs_spent,
+            'status_pie': fig_pie,
+            'scatter': fig_scatter,
+        }
+
+    return figure_cache.figures.get_or_build(('project_overview', version), build)
@@ -0,0 +1,62 @@
+from db import budget_table, costs_table, cost_estimations_table
+from sections.table_page import TablePage
+
+
+budget_management = TablePage(
+    budget_table,
+    title="Budget Management",
+    item="Budget Entry",
+    columns={'category': 'Category', 'allocated': 'Allocated', 'spent': 'Spent'},
+    fields={
+        'category': ('text_input', "Category", {}),
+        'allocated': ('number_input', "Allocated Budget", {'min_value': 0}),
+        'spent': ('number_input', "Spent Budget", {'min_value': 0}),
+    },
+    charts=[
+        ('bar', {'x': 'Category', 'y': ['Allocated', 'Spent'], 'barmode': 'group', 'title': "Budget Allocation and Spending"}),
+        ('pie', {'names': 'Category', 'values': 'Allocated', 'title': "Budget Allocation by Category"}),
+        ('sunburst', {'path': ['Category'], 'values': 'Spent', 'title': "Spent Budget Sunburst"}),
+    ],
+    data_title="Budget Data",
+    file_name="budget_data.csv",
+    empty_message="No budget data to display for this project. Please add a budget entry."
+)
+
+
+cost_management = TablePage(
+    costs_table,
+    title="Cost Management",
+    item="Cost Entry",
+    columns={'category': 'Category', 'planned_cost': 'Planned Cost', 'actual_cost': 'Actual Cost', 'status': 'Status'},
+    fields={
+        'category': ('text_input', "Category", {}),
+        'planned_cost': ('number_input', "Planned Cost", {'min_value': 0}),
+        'actual_cost': ('number_input', "Actual Cost", {'min_value': 0}),
+        'status': ('selectbox', "Status", {'options': ["On Track", "Over Budget", "Under Budget"]}),
+    },
+    charts=[
+        ('bar', {'x': 'Category', 'y': ['Planned Cost', 'Actual Cost'], 'barmode': 'group', 'title': "Planned vs Actual Costs"}),
+        ('pie', {'names': 'Status', 'title': "Cost Status Distribution"}),
+    ],
+    data_title="Cost Data",
+    file_name="cost_data.csv",
+    empty_message="No cost data to display for this project. Please add a cost entry."
+)
+
+
+cost_estimation = TablePage(
+    cost_estimations_table,
+    title="Cost Estimation",
+    item="Cost Estimation",
+    columns={'item': 'Item', 'estimated_cost': 'Estimated Cost'},
+    fields={
+        'item': ('text_input', "Item", {}),
+        'estimated_cost': ('number_input', "Estimated Cost", {'min_value': 0}),
+    },
+    charts=[
+        ('bar', {'x': 'Item', 'y': 'Estimated Cost', 'title': "Cost Estimations"}),
+    ],
+    data_title="Cost Estimations",
+    file_name="cost_estimations_data.csv",
+    empty_message="No cost estimations to display for this project. Please add a cost estimation."
+)
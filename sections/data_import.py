@@ -0,0 +1,39 @@
+import streamlit as st
+import pandas as pd
+
+import bulk_import
+from sections.common import get_projects
+
+
+def bulk_import_page():
+    st.title("Bulk Import")
+
+    st.write("Load a CSV or Parquet file into one table. Column names must match the table's columns; the id column is ignored.")
+
+    table_name = st.selectbox("Target Table", list(bulk_import.IMPORT_TABLES))
+    uploaded_file = st.file_uploader("Data File", type=["csv", "parquet"])
+    chunksize = st.number_input("Rows per Batch", min_value=100, value=bulk_import.DEFAULT_CHUNKSIZE, step=100)
+    strict = st.checkbox("Abort the whole import if any row is invalid")
+
+    if uploaded_file is not None and st.button("Import"):
+        progress_bar = st.progress(0.0)
+        progress_text = st.empty()
+
+        def show_progress(report):
+            if report['total_rows']:
+                progress_bar.progress(min(report['rows_read'] / report['total_rows'], 1.0))
+            progress_text.write(f"Chunk {report['chunks']}: {report['rows_read']} rows read, {report['rows_inserted']} inserted, {report['rows_rejected']} rejected")
+
+        try:
+            report = bulk_import.import_file(uploaded_file, table_name, chunksize=int(chunksize), strict=strict, progress=show_progress)
+        except bulk_import.BulkImportError as exc:
+            st.error(str(exc))
+            return
+
+        progress_bar.progress(1.0)
+        if table_name == 'projects':
+            get_projects.clear()
+        st.success(f"Imported {report['rows_inserted']} of {report['rows_read']} rows into {table_name}.")
+        if report['errors']:
+            st.warning(f"{report['rows_rejected']} rows were rejected.")
+            st.dataframe(pd.DataFrame(report['errors'], columns=['Row', 'Error']))
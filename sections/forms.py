@@ -0,0 +1,47 @@
+from concurrent.futures import TimeoutError
+
+import streamlit as st
+
+import write_queue
+
+# Form submissions go through the write-behind queue. This module stays light (no pandas
+# or plotly) because app.py shows pending confirmations on every run.
+
+# How long a submit waits for the background writer before confirming later instead
+CONFIRM_TIMEOUT = 2.0
+
+
+# Insert a form's row through the write-behind queue. Normally the writer commits well
+# within CONFIRM_TIMEOUT and the page confirms straight away, so the new row shows up in
+# this run; otherwise the confirmation is shown by show_write_confirmations() on a later run.
+# Rows of project tables need a project; the picker is empty until one is added.
+def save_row(table, values, message, on_commit=None):
+    if 'project_id' in table.c and values.get('project_id') is None:
+        st.error("Could not save: add a project first.")
+        return
+    future = write_queue.writer.submit(table, values, on_commit)
+    try:
+        future.result(timeout=CONFIRM_TIMEOUT)
+    except TimeoutError:
+        st.session_state.setdefault('pending_writes', []).append((future, message))
+        st.info("Saving in the background. You'll see a confirmation once it's written.")
+    except Exception as exc:
+        st.error(f"Could not save: {exc}")
+    else:
+        st.success(message)
+
+
+# Confirm (or report) background writes from earlier runs that have finished since
+def show_write_confirmations():
+    pending = st.session_state.get('pending_writes')
+    if not pending:
+        return
+    still_pending = []
+    for future, message in pending:
+        if not future.done():
+            still_pending.append((future, message))
+        elif future.exception() is not None:
+            st.error(f"Could not save: {future.exception()}")
+        else:
+            st.toast(message)
+    st.session_state['pending_writes'] = still_pending
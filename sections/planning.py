@@ -0,0 +1,262 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
+from sqlalchemy import select, text
+
+import capacity
+import chart_render
+import figure_cache
+import history
+import schedule
+from db import metadata, project_snapshots_table, projects_table, tasks_table, resources_table, task_dependencies_table
+from sections.common import session, get_projects, select_project
+from sections.table_page import TablePage
+
+
+def project_schedule():
+    st.title("Project Schedule: Monthly Activity Planning")
+
+    selected_project_id = select_project()
+    
+    with st.form("add_activity_form"):
+        st.subheader("Add New Activity")
+        month = st.selectbox("Month", ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"])
+        num_activities = st.number_input("Number of Activities", min_value=0)
+        submitted = st.form_submit_button("Add Activity")
+        if submitted:
+            activities = session.execute(text("SELECT activities FROM projects WHERE id = :project_id"), {"project_id": selected_project_id}).fetchone()[0]
+            if not activities:
+                activities = {}
+            if selected_project_id not in activities:
+                activities[selected_project_id] = {}
+            activities[selected_project_id][month] = num_activities
+            session.execute(projects_table.update().where(projects_table.c.id == selected_project_id).values(activities=activities))
+            session.commit()
+            st.success("Activity added successfully!")
+
+    activities = session.execute(text("SELECT activities FROM projects WHERE id = :project_id"), {"project_id": selected_project_id}).fetchone()[0]
+    if activities and selected_project_id in activities:
+        activities_df = pd.DataFrame(list(activities[selected_project_id].items()), columns=['Month', 'Number of Activities'])
+        fig_activities = px.bar(activities_df, x='Month', y='Number of Activities', title="Monthly Activities")
+        st.plotly_chart(fig_activities, use_container_width=True)
+    else:
+        st.info("No activities to display. Please add an activity.")
+
+
+# Finish-to-start links used by the critical path on the Gantt chart. Tasks are entered by
+# id (shown in the task table) so projects with thousands of tasks don't need a huge selectbox.
+def task_dependency_form(project_id):
+    with st.form("add_task_dependency_form"):
+        st.subheader("Add Task Dependency")
+        task_id = st.number_input("Task ID", min_value=1, step=1)
+        depends_on_id = st.number_input("Depends on Task ID (must finish first)", min_value=1, step=1)
+        submitted = st.form_submit_button("Add Dependency")
+        if submitted:
+            found = session.execute(
+                select(tasks_table.c.id)
+                .where(tasks_table.c.project_id == project_id)
+                .where(tasks_table.c.id.in_([task_id, depends_on_id]))
+            ).scalars().all()
+            dependencies = session.execute(
+                select(task_dependencies_table.c.task_id, task_dependencies_table.c.depends_on_id)
+                .where(task_dependencies_table.c.project_id == project_id)
+            ).fetchall()
+            if task_id not in found or depends_on_id not in found:
+                st.error("Both tasks must belong to this project.")
+            elif schedule.creates_cycle([tuple(row) for row in dependencies], task_id, depends_on_id):
+                st.error("That dependency would create a cycle.")
+            else:
+                session.execute(task_dependencies_table.insert().values(
+                    project_id=project_id, task_id=task_id, depends_on_id=depends_on_id
+                ))
+                session.commit()
+                st.success("Dependency added successfully!")
+
+
+task_management = TablePage(
+    tasks_table,
+    title="Task Management",
+    item="Task",
+    columns={'task': 'Task', 'priority': 'Priority', 'status': 'Status', 'start_date': 'Start Date', 'end_date': 'End Date'},
+    fields={
+        'task': ('text_input', "Task", {}),
+        'priority': ('selectbox', "Priority", {'options': ["High", "Medium", "Low"]}),
+        'status': ('selectbox', "Status", {'options': ["Not Started", "In Progress", "Completed"]}),
+        'start_date': ('date_input', "Start Date", {}),
+        'end_date': ('date_input', "End Date", {}),
+    },
+    paged=True,
+    filters={'priority': ("Priority", ["High", "Medium", "Low"]), 'status': ("Status", ["Not Started", "In Progress", "Completed"])},
+    search=('task', "Search Tasks"),
+    charts=[
+        ('timeline', {'x_start': "Start Date", 'x_end': "End Date", 'y': "Task", 'color': "Status", 'title': "Task Management (current page)"}),
+    ],
+    data_title="Task Data",
+    file_name="task_data.csv",
+    empty_message="No tasks to display for this project. Please add a task.",
+    footer=task_dependency_form
+)
+
+
+# CPM results only change with tasks or dependencies, so they are cached on both table versions
+@st.cache_data(max_entries=8)
+def load_project_schedule(versions, project_id):
+    return schedule.project_schedule(project_id)
+
+
+def gantt_chart():
+    st.title("Gantt Chart")
+
+    selected_project_id = select_project()
+
+    gantt_color = st.color_picker("Pick a Gantt Chart Bar Color", "#1f77b4")
+    critical_color = st.color_picker("Pick a Critical Path Bar Color", "#d62728")
+    bar_dates = st.radio("Bars show", ["Planned dates", "Projected dates (early start/finish)"], horizontal=True)
+
+    versions = (figure_cache.table_version(tasks_table), figure_cache.table_version(task_dependencies_table))
+    try:
+        task_df = load_project_schedule(versions, selected_project_id)
+    except schedule.ScheduleError as error:
+        st.error(str(error))
+        return
+    if not task_df.empty:
+        critical = task_df[task_df['Critical']]
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Critical Tasks", f"{len(critical):,}")
+        col2.metric("Projected Finish", str(task_df['Early Finish'].max()))
+        col3.metric("Projected Slip (days)", int(task_df['Slip (days)'].max()))
+
+        gantt_df = task_df.assign(Path=np.where(task_df['Critical'], "Critical path", "Has float"))
+        start, end = ("Start Date", "End Date") if bar_dates == "Planned dates" else ("Early Start", "Early Finish")
+        fig_gantt = px.timeline(
+            gantt_df, x_start=start, x_end=end, y="Task", color="Path", title="Gantt Chart",
+            color_discrete_map={"Critical path": critical_color, "Has float": gantt_color},
+            hover_data=['id', 'Priority', 'Float', 'Slip (days)']
+        )
+        st.plotly_chart(fig_gantt, use_container_width=True)
+        # Rasterising a chart with thousands of bars is slow, so only do it on request
+        if st.button("Prepare Gantt Chart PNG"):
+            st.download_button(
+                label="Download Gantt Chart",
+                data=chart_render.render_pngs({"Gantt Chart": fig_gantt})["Gantt Chart"],
+                file_name="gantt_chart.png",
+                mime="image/png"
+            )
+
+        st.subheader("Schedule")
+        st.dataframe(task_df[['id', 'Task', 'Start Date', 'End Date'] + schedule.SCHEDULE_COLUMNS])
+    else:
+        st.info("No tasks to display in Gantt chart.")
+
+
+# Snapshots are only written alongside inserts into the tracked tables, so their versions
+# (with the snapshot table's own, for the start-of-history seed) cover same-day upserts
+@st.cache_data(max_entries=8)
+def load_burn_history(versions, start, end, project_id):
+    return history.load_history(start, end, project_id)
+
+
+def burn_chart(history_df, series, title, yaxis_title):
+    fig = go.Figure([
+        go.Scatter(x=history_df.index, y=values, name=name, line_shape='hv', mode='lines')
+        for name, values in series.items()
+    ])
+    fig.update_layout(title_text=title, xaxis_title="Date", yaxis_title=yaxis_title, hovermode="x unified")
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def burn_charts():
+    st.title("Burn Charts")
+
+    projects = get_projects()
+    selected_project_id = st.selectbox(
+        "Select Project Name", [None, *projects], format_func=lambda project_id: "All Projects" if project_id is None else projects[project_id]
+    )
+    today = pd.Timestamp.today().date()
+    col1, col2 = st.columns(2)
+    start_date = col1.date_input("From", today - pd.Timedelta(days=180), max_value=today)
+    end_date = col2.date_input("To", today, min_value=start_date, max_value=today)
+
+    versions = tuple(
+        figure_cache.table_version(table)
+        for table in [metadata.tables[name] for name in sorted(history.TRACKED_TABLES)] + [project_snapshots_table]
+    )
+    history_df = load_burn_history(versions, start_date, end_date, selected_project_id).dropna()
+    if history_df.empty:
+        st.info("No history recorded for this range yet. Levels are recorded each day projects, tasks, issues, risks, budget or costs are added.")
+        return
+
+    latest = history_df.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tasks Remaining", f"{int(latest['tasks'] - latest['tasks_completed']):,}")
+    col2.metric("Tasks Completed", f"{int(latest['tasks_completed']):,}")
+    col3.metric("Open Issues", f"{int(latest['open_issues']):,}")
+    col4.metric("Open Risks", f"{int(latest['open_risks']):,}")
+
+    burn_chart(history_df, {"Remaining": history_df['tasks'] - history_df['tasks_completed']}, "Task Burn-Down", "Tasks")
+    burn_chart(history_df, {"Completed": history_df['tasks_completed'], "Scope": history_df['tasks']}, "Task Burn-Up", "Tasks")
+    burn_chart(history_df, {"Spent": history_df['spent'], "Budget": history_df['budget']}, "Spend Against Budget", "Amount")
+    burn_chart(history_df, {"Open Issues": history_df['open_issues'], "Open Risks": history_df['open_risks']}, "Open Issues and Risks", "Count")
+
+    st.download_button(
+        label="Download History",
+        data=history_df.to_csv(),
+        file_name="project_history.csv",
+        mime="text/csv"
+    )
+
+
+# Utilization depends on resources, project dates and task spans, so it is cached on all three
+@st.cache_data(max_entries=4)
+def load_utilization(versions):
+    return capacity.portfolio_utilization()
+
+
+def portfolio_resource_capacity():
+    st.subheader("Portfolio Resource Capacity")
+
+    versions = tuple(figure_cache.table_version(table) for table in (resources_table, projects_table, tasks_table))
+    segments = load_utilization(versions)
+    if segments.empty:
+        st.info("No dated resource bookings across the portfolio yet.")
+        return
+
+    overbooked = capacity.overbooked_periods(segments)
+    col1, col2 = st.columns(2)
+    col1.metric("Overbooked People", f"{overbooked['Resource Name'].nunique():,}")
+    col2.metric("Overbooked Periods", f"{len(overbooked):,}")
+
+    peaks = capacity.monthly_peak(segments)
+    fig_capacity = go.Figure(data=go.Heatmap(
+        z=peaks.to_numpy(), x=peaks.columns, y=peaks.index, colorscale="RdYlGn_r", zmin=0, zmax=2 * capacity.CAPACITY,
+        hovertemplate="%{y}<br>%{x}<br>Peak utilization %{z:.0f}%<extra></extra>"
+    ))
+    fig_capacity.update_layout(title_text=f"Peak Monthly Utilization (top {len(peaks)} people)", xaxis_title="Month", yaxis_title="Resource")
+    st.plotly_chart(fig_capacity, use_container_width=True)
+
+    if not overbooked.empty:
+        st.subheader("Overbooked Periods")
+        st.dataframe(overbooked, hide_index=True)
+
+
+resource_tracking = TablePage(
+    resources_table,
+    title="Resource Tracking",
+    item="Resource",
+    columns={'resource_name': 'Resource Name', 'allocation': 'Allocation'},
+    fields={
+        'resource_name': ('text_input', "Resource Name", {}),
+        'allocation': ('number_input', "Allocation Percentage", {'min_value': 0, 'max_value': 100}),
+    },
+    charts=[
+        ('pie', {'names': 'Resource Name', 'values': 'Allocation', 'title': "Resource Allocation"}),
+        ('bar', {'x': 'Resource Name', 'y': 'Allocation', 'title': "Resource Allocation Percentage"}),
+        ('pie', {'names': 'Resource Name', 'values': 'Allocation', 'hole': 0.3, 'title': "Resource Allocation Donut Chart"}),
+    ],
+    data_title="Resource Data",
+    file_name="resource_data.csv",
+    empty_message="No resources to display for this project. Please add a resource.",
+    footer=lambda project_id: portfolio_resource_capacity()
+)
@@ -0,0 +1,36 @@
+import streamlit as st
+
+import chart_render
+import figure_cache
+import pdf_report
+from db import projects_table
+from sections.common import load_project_df, project_overview_figures
+
+
+def make_presentation():
+    st.title("Make Presentation")
+
+    # Charts are rendered in parallel into memory, reusing cached PNGs for unchanged data
+    def generate_charts():
+        version = figure_cache.table_version(projects_table)
+        project_df = load_project_df(version)
+        if project_df.empty:
+            return {}
+        chart_titles = {
+            'timeline': "Project Status Timeline",
+            'budget_vs_spent': "Budget vs Spent",
+            'status_pie': "Project Status Distribution",
+            'scatter': "Budget vs Spent by Status",
+        }
+        chart_pngs = chart_render.render_pngs(project_overview_figures(version, project_df))
+        return {chart_titles[name]: png for name, png in chart_pngs.items()}
+
+    if st.button("Generate PDF"):
+        with st.spinner("Building presentation..."):
+            pdf_bytes = pdf_report.build_presentation(generate_charts())
+        st.download_button(
+            label="Download Presentation PDF",
+            data=pdf_bytes,
+            file_name="presentation.pdf",
+            mime="application/pdf"
+        )
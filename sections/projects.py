@@ -0,0 +1,217 @@
+import datetime
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import analytics
+import figure_cache
+import rollup
+import summary
+from db import (
+    named_select,
+    projects_table, budget_table, milestones_table, charter_table, costs_table, portfolio_table
+)
+from sections.common import get_projects, load_project_df, project_overview_figures
+from sections.table_page import TablePage
+from sections.forms import save_row
+
+
+def dashboard():
+    st.title("Business Transformation Project Tracker")
+
+    with st.form("add_project_form"):
+        st.subheader("Add New Project")
+        project_name = st.text_input("Project Name")
+        start_date = st.date_input("Start Date")
+        end_date = st.date_input("End Date")
+        budget = st.number_input("Budget", min_value=0)
+        spent = st.number_input("Spent", min_value=0)
+        status = st.selectbox("Status", ["Not Started", "In Progress", "Completed"])
+        portfolio = st.selectbox("Portfolio", ["Turnaround project", "Special project", "Digitisation and automation"])
+        impact = st.number_input("Impact on Business", min_value=0)
+        deliverable = st.text_input("Deliverable")
+        timeline = st.text_input("Timeline")
+        submitted = st.form_submit_button("Add Project")
+        if submitted:
+            new_project = {
+                'name': project_name,
+                'start_date': start_date,
+                'end_date': end_date,
+                'budget': budget,
+                'spent': spent,
+                'status': status,
+                'portfolio': portfolio,
+                'impact': impact,
+                'deliverable': deliverable,
+                'timeline': timeline
+            }
+            save_row(projects_table, new_project, f"Project added successfully! Project Name: {project_name}", on_commit=get_projects.clear)
+
+    version = figure_cache.table_version(projects_table)
+    project_df = load_project_df(version)
+
+    if not project_df.empty:
+        for fig in project_overview_figures(version, project_df).values():
+            st.plotly_chart(fig, use_container_width=True)
+
+        earned_value_panel()
+
+        st.subheader("Project Data")
+        st.dataframe(project_df)
+    else:
+        st.info("No projects to display. Please add a project.")
+
+
+@st.cache_data(max_entries=4)
+def load_portfolio_rollup(versions, as_of):
+    return rollup.portfolio_rollup(as_of)
+
+
+def executive_overview():
+    st.title("Executive Overview")
+
+    summary_rows = summary.load_summary()
+    summary_df = pd.DataFrame(summary_rows, columns=summary.SUMMARY_COLUMNS).fillna({
+        name: 0 for name in summary.SUMMARY_COLUMNS if name not in ('project_id', 'project_name', 'portfolio', 'status', 'max_open_severity')
+    }).infer_objects()
+    if summary_df.empty:
+        st.info("No projects to display. Please add a project.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Projects", len(summary_df))
+    col2.metric("Open Issues", int(summary_df['open_issues'].sum()))
+    col3.metric("Open Risk Exposure", f"{summary_df['open_risk_exposure'].sum():.2f}")
+    col4.metric("Tasks Completed", f"{int(summary_df['tasks_completed'].sum())} / {int(summary_df['tasks'].sum())}")
+
+    top_exposure = summary_df.nlargest(20, 'open_risk_exposure')
+    fig_exposure = px.bar(top_exposure, x='project_name', y='open_risk_exposure', color='max_open_severity', labels={'project_name': 'Project Name', 'open_risk_exposure': 'Open Risk Exposure', 'max_open_severity': 'Max Severity'}, title="Top Projects by Open Risk Exposure")
+    st.plotly_chart(fig_exposure, use_container_width=True)
+
+    top_issues = summary_df.nlargest(20, 'open_issues')
+    fig_issues = px.bar(top_issues, x='project_name', y=['high_priority_open_issues', 'open_issues'], barmode='group', labels={'project_name': 'Project Name', 'value': 'Issues', 'variable': ''}, title="Top Projects by Open Issues")
+    st.plotly_chart(fig_issues, use_container_width=True)
+
+    top_tasks = summary_df.nlargest(20, 'tasks')
+    fig_tasks = px.bar(top_tasks, x='project_name', y=['tasks_not_started', 'tasks_in_progress', 'tasks_completed'], labels={'project_name': 'Project Name', 'value': 'Tasks', 'variable': 'Status'}, title="Tasks by Status")
+    st.plotly_chart(fig_tasks, use_container_width=True)
+
+    st.subheader("Project Summary")
+    st.dataframe(summary_df, hide_index=True)
+    st.download_button(
+        label="Download Project Summary",
+        data=summary_df.to_csv(index=False),
+        file_name="project_summary.csv",
+        mime="text/csv"
+    )
+
+
+# Portfolio-wide earned value rollup shown on the dashboard
+def earned_value_panel():
+    st.subheader("Earned Value Rollup")
+    versions = tuple(figure_cache.table_version(table) for table in (projects_table, budget_table, costs_table))
+    as_of = datetime.date.today()
+    project_evm, portfolio_evm = load_portfolio_rollup(versions, as_of)
+
+    totals = portfolio_evm.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Portfolio CPI", f"{totals['CPI']:.2f}")
+    col2.metric("Portfolio SPI", f"{totals['SPI']:.2f}")
+    col3.metric("Estimate at Completion", f"{totals['EAC']:,.0f}")
+    col4.metric("Variance at Completion", f"{totals['VAC']:,.0f}")
+
+    st.dataframe(portfolio_evm, hide_index=True)
+
+    def build():
+        fig_evm = px.scatter(project_evm, x='SPI', y='CPI', color='Portfolio', hover_name='Project Name', hover_data=['BAC', 'EAC', 'VAC'], title="Cost vs Schedule Performance by Project")
+        fig_evm.add_hline(y=1, line_dash="dash")
+        fig_evm.add_vline(x=1, line_dash="dash")
+        return {'evm_scatter': fig_evm}
+
+    figures = figure_cache.figures.get_or_build(('earned_value', versions, as_of), build)
+    st.plotly_chart(figures['evm_scatter'], use_container_width=True)
+
+    with st.expander("Project Earned Value Data"):
+        st.dataframe(project_evm, hide_index=True)
+        st.download_button(
+            label="Download Earned Value Data",
+            data=project_evm.to_csv(index=False),
+            file_name="earned_value_data.csv",
+            mime="text/csv"
+        )
+
+
+project_charter = TablePage(
+    charter_table,
+    title="Project Charter",
+    item="Charter Entry",
+    columns={'objective': 'Objective', 'scope': 'Scope', 'stakeholders': 'Stakeholders'},
+    fields={
+        'objective': ('text_input', "Objective", {}),
+        'scope': ('text_area', "Scope", {}),
+        'stakeholders': ('text_area', "Stakeholders", {}),
+    },
+    charts=[
+        ('sunburst', {'path': ['Objective', 'Scope'], 'title': "Project Charter Sunburst Chart"}),
+    ],
+    data_title="Project Charter Data",
+    file_name="charter_data.csv",
+    empty_message="No charter entries to display for this project. Please add a charter entry."
+)
+
+
+project_milestones = TablePage(
+    milestones_table,
+    title="Project Milestones",
+    item="Milestone",
+    columns={'milestone': 'Milestone', 'due_date': 'Due Date', 'status': 'Status'},
+    fields={
+        'milestone': ('text_input', "Milestone", {}),
+        'due_date': ('date_input', "Due Date", {}),
+        'status': ('selectbox', "Status", {'options': ["Not Started", "In Progress", "Completed"]}),
+    },
+    charts=[
+        ('timeline', {'x_start': "Due Date", 'x_end': "Due Date", 'y': "Milestone", 'color': "Status", 'title': "Project Milestones"}),
+        ('pie', {'names': 'Status', 'title': "Milestone Status Distribution"}),
+    ],
+    data_title="Milestone Data",
+    file_name="milestone_data.csv",
+    empty_message="No milestones to display for this project. Please add a milestone."
+)
+
+
+def portfolio_tracking():
+    st.title("Portfolio Tracking")
+
+    portfolio_df = analytics.fetch_frame(named_select(portfolio_table), ['id', 'Project Name', 'Portfolio Type'])
+    if not portfolio_df.empty:
+        fig_portfolio = px.pie(portfolio_df, names='Portfolio Type', title="Portfolio Distribution")
+        st.plotly_chart(fig_portfolio, use_container_width=True)
+
+        fig_portfolio_timeline = px.timeline(portfolio_df, x_start="Start Date", x_end="End Date", y="Project Name", color="Portfolio Type", title="Project Portfolio Timeline")
+        st.plotly_chart(fig_portfolio_timeline, use_container_width=True)
+
+        st.subheader("Portfolio Data")
+        st.dataframe(portfolio_df)
+        st.download_button(
+            label="Download Portfolio Data",
+            data=portfolio_df.to_csv(index=False),
+            file_name="portfolio_data.csv",
+            mime="text/csv"
+        )
+    else:
+        st.info("No portfolio entries to display. Please add a portfolio entry.")
+
+
+def visualizations():
+    st.title("Visualizations")
+
+    version = figure_cache.table_version(projects_table)
+    project_df = load_project_df(version)
+    if not project_df.empty:
+        for fig in project_overview_figures(version, project_df).values():
+            st.plotly_chart(fig, use_container_width=True)
+
+    else:
+        st.info("No projects to display. Please add a project.")
@@ -0,0 +1,37 @@
+import streamlit as st
+import pandas as pd
+
+import analytics
+import report_export
+from db import named_select
+
+
+def reporting():
+    st.title("Reporting")
+
+    st.write("Generate reports based on the data from different sections.")
+
+    counts = report_export.table_counts()
+    st.subheader("Report Contents")
+    st.dataframe(pd.DataFrame(list(counts.items()), columns=['Section', 'Rows']), hide_index=True)
+
+    sections = {title: (table, headings) for title, table, headings in report_export.REPORT_SECTIONS}
+    preview_section = st.selectbox("Preview Section", list(sections))
+    preview_table, preview_headings = sections[preview_section]
+    preview_rows = analytics.fetch_all(named_select(preview_table).order_by(preview_table.c.id).limit(100))
+    st.dataframe(pd.DataFrame(preview_rows, columns=preview_headings), hide_index=True)
+    if counts[preview_section] > len(preview_rows):
+        st.caption(f"Showing the first {len(preview_rows)} of {counts[preview_section]} rows. The full report includes every row.")
+
+    st.subheader("Download Full Report")
+    export_format = st.radio("Format", list(report_export.EXPORT_FORMATS), format_func=lambda name: report_export.EXPORT_FORMATS[name][0])
+    if st.button("Prepare Full Report"):
+        label, file_name, mime = report_export.EXPORT_FORMATS[export_format]
+        with st.spinner("Exporting all tables..."):
+            report_data = report_export.export_report_bytes(export_format)
+        st.download_button(
+            label=f"Download Full Report ({label})",
+            data=report_data,
+            file_name=file_name,
+            mime=mime
+        )
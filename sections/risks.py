@@ -0,0 +1,67 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+import figure_cache
+import risk_exposure
+from db import risks_table
+from sections.table_page import TablePage
+
+
+# Heatmap cells and top risks only change when a risk is added, so both are cached on the risks table version
+@st.cache_data(max_entries=8)
+def load_risk_heatmap(version, status):
+    likelihood, impact, severity = risk_exposure.load_risk_points(status)
+    return risk_exposure.risk_heatmap(likelihood, impact, severity)
+
+
+@st.cache_data(max_entries=8)
+def load_top_risks(version, status, limit):
+    rows = risk_exposure.top_exposures(limit, status)
+    return pd.DataFrame(rows, columns=['id', 'Project Name', 'Risk', 'Likelihood', 'Impact', 'Severity', 'Status'])
+
+
+def portfolio_risk_exposure():
+    st.subheader("Portfolio Risk Exposure")
+
+    status_choice = st.selectbox("Risk Status", ["All"] + risk_exposure.RISK_STATUSES, index=1)
+    status = None if status_choice == "All" else status_choice
+    version = figure_cache.table_version(risks_table)
+    edges, counts, exposure = load_risk_heatmap(version, status)
+
+    if not counts.sum():
+        st.info("No risks recorded across the portfolio yet.")
+        return
+
+    labels = [f"{low:.1f}-{high:.1f}" for low, high in zip(edges[:-1], edges[1:])]
+    heatmap_value = st.radio("Heatmap Value", ["Risk Count", "Total Severity"], horizontal=True)
+    values = counts if heatmap_value == "Risk Count" else exposure
+    fig_heatmap = go.Figure(data=go.Heatmap(z=values, x=labels, y=labels, colorscale="Reds", text=counts.astype(int), hovertemplate="Likelihood %{x}<br>Impact %{y}<br>Risks %{text}<br>Value %{z:.2f}<extra></extra>"))
+    fig_heatmap.update_layout(title_text=f"Likelihood x Impact Heatmap ({heatmap_value})", xaxis_title="Likelihood", yaxis_title="Impact")
+    st.plotly_chart(fig_heatmap, use_container_width=True)
+
+    limit = st.slider("Top Risks by Severity", 5, 100, 20)
+    st.dataframe(load_top_risks(version, status, limit), hide_index=True)
+
+
+risk_management = TablePage(
+    risks_table,
+    title="Risk Management",
+    item="Risk",
+    columns={'risk': 'Risk', 'likelihood': 'Likelihood', 'impact': 'Impact', 'severity': 'Severity', 'status': 'Status'},
+    fields={
+        'risk': ('text_input', "Risk", {}),
+        'likelihood': ('slider', "Likelihood", {'min_value': 0.0, 'max_value': 1.0, 'value': 0.5}),
+        'impact': ('slider', "Impact", {'min_value': 0.0, 'max_value': 1.0, 'value': 0.5}),
+        'status': ('selectbox', "Status", {'options': ["Open", "Mitigated", "Closed"]}),
+    },
+    computed={'severity': lambda values: values['likelihood'] * values['impact']},
+    charts=[
+        ('scatter', {'x': 'Likelihood', 'y': 'Impact', 'size': 'Severity', 'color': 'Status', 'hover_name': 'Risk', 'title': "Risk Likelihood vs Impact"}),
+        ('pie', {'names': 'Status', 'title': "Risk Status Distribution"}),
+    ],
+    data_title="Risk Data",
+    file_name="risk_data.csv",
+    empty_message="No risks to display for this project. Please add a risk.",
+    footer=lambda project_id: portfolio_risk_exposure()
+)
@@ -0,0 +1,121 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy_financial as npf
+
+import portfolio_roi
+import simulation
+from sections.common import session, get_projects, select_project
+
+
+def roi_calculation():
+    st.title("ROI Calculation")
+
+    with st.form("roi_calculation_form"):
+        st.subheader("ROI Calculation")
+        initial_investment = st.number_input("Initial Investment", min_value=0.0)
+        cash_flows = st.text_area("Annual Cash Flows (comma separated)")
+        years = st.number_input("Number of Years", min_value=1)
+        submitted = st.form_submit_button("Calculate ROI")
+        if submitted:
+            cash_flows = list(map(float, cash_flows.split(',')))
+            total_return = sum(cash_flows)
+            roi = (total_return - initial_investment) / initial_investment * 100
+            irr = npf.irr([-initial_investment] + cash_flows) * 100
+            st.success(f"ROI: {roi:.2f}%")
+            st.success(f"IRR: {irr:.2f}%")
+
+    st.subheader("Portfolio ROI")
+    st.write("Store a cash-flow series per project and rank the whole portfolio by IRR.")
+
+    with st.form("project_cash_flows_form"):
+        cash_flow_project = select_project(key="cash_flow_project")
+        project_cash_flows = st.text_area("Cash Flows from Year 0 (comma separated, investment as a negative number)")
+        saved = st.form_submit_button("Save Cash Flows")
+        if saved:
+            try:
+                amounts = [float(value) for value in project_cash_flows.split(',')]
+            except ValueError:
+                st.error("Cash flows must be numbers separated by commas.")
+            else:
+                portfolio_roi.save_cash_flows(session, cash_flow_project, amounts)
+                st.success(f"Cash flows saved for {get_projects()[cash_flow_project]}.")
+
+    portfolio_discount_rate = st.number_input("Portfolio Discount Rate (%)", value=10.0) / 100
+    roi_df = portfolio_roi.portfolio_roi(portfolio_discount_rate)
+    if not roi_df.empty:
+        top_projects = roi_df.dropna(subset=['IRR']).head(20)
+        fig_portfolio_irr = px.bar(top_projects, x='Project Name', y='IRR', color='NPV', title="Top Projects by IRR")
+        fig_portfolio_irr.update_yaxes(tickformat=".0%")
+        st.plotly_chart(fig_portfolio_irr, use_container_width=True)
+
+        st.dataframe(roi_df, hide_index=True)
+        st.download_button(
+            label="Download Portfolio ROI Data",
+            data=roi_df.to_csv(index=False),
+            file_name="portfolio_roi_data.csv",
+            mime="text/csv"
+        )
+    else:
+        st.info("No cash flows stored yet. Save a project's cash flows to rank the portfolio.")
+
+    st.subheader("Monte Carlo Simulation")
+    st.write("Sample each year's cash flow from a distribution and see the spread of NPV and IRR across many scenarios.")
+
+    distribution = st.selectbox("Cash Flow Distribution", simulation.DISTRIBUTIONS)
+    simulation_years = st.number_input("Years to Simulate", min_value=1, max_value=50, value=5)
+    if distribution == "Normal":
+        parameter_columns = ["Mean", "Std Dev"]
+        default_parameters = [[100.0, 20.0]]
+    else:
+        parameter_columns = ["Low", "Mode", "High"]
+        default_parameters = [[60.0, 100.0, 140.0]]
+    parameters_df = pd.DataFrame(default_parameters * int(simulation_years), columns=parameter_columns, index=pd.RangeIndex(1, int(simulation_years) + 1, name="Year"))
+
+    with st.form("roi_simulation_form"):
+        simulation_investment = st.number_input("Initial Investment", min_value=0.0, value=300.0)
+        parameters_df = st.data_editor(parameters_df, use_container_width=True)
+        scenarios = st.number_input("Scenarios", min_value=1000, max_value=1000000, value=100000, step=10000)
+        discount_rate = st.number_input("Discount Rate (%)", value=10.0) / 100
+        seed = st.number_input("Random Seed (0 for random)", min_value=0, value=0)
+        simulate = st.form_submit_button("Run Simulation")
+
+    if simulate:
+        if distribution == "Triangular" and not ((parameters_df["Low"] <= parameters_df["Mode"]) & (parameters_df["Mode"] <= parameters_df["High"]) & (parameters_df["Low"] < parameters_df["High"])).all():
+            st.error("Each year needs Low <= Mode <= High, with Low below High.")
+            return
+        if distribution == "Normal" and (parameters_df["Std Dev"] < 0).any():
+            st.error("Standard deviations cannot be negative.")
+            return
+
+        with st.spinner("Running simulation..."):
+            result = simulation.run_simulation(
+                simulation_investment, distribution, parameters_df.to_numpy(), int(scenarios), discount_rate, int(seed) or None
+            )
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Median NPV", f"{result['npv_summary']['P50']:,.2f}")
+        col2.metric("Median IRR", f"{result['irr_summary']['P50'] * 100:.2f}%")
+        col3.metric("Probability NPV > 0", f"{result['probability_positive_npv'] * 100:.1f}%")
+
+        summary_df = pd.DataFrame({
+            "NPV": result['npv_summary'],
+            "IRR (%)": {name: value * 100 for name, value in result['irr_summary'].items()},
+            "ROI (%)": {name: value * 100 for name, value in result['roi_summary'].items()},
+        })
+        st.dataframe(summary_df)
+        if result['irr_undefined']:
+            st.info(f"IRR is undefined for {result['irr_undefined']} scenarios whose cash flows never break even.")
+
+        npv_centers, npv_counts = simulation.histogram(result['npv'])
+        fig_npv = px.bar(x=npv_centers, y=npv_counts, labels={'x': 'NPV', 'y': 'Scenarios'}, title="NPV Distribution")
+        fig_npv.update_traces(marker_line_width=0)
+        fig_npv.update_layout(bargap=0)
+        fig_npv.add_vline(x=0, line_dash="dash")
+        st.plotly_chart(fig_npv, use_container_width=True)
+
+        irr_centers, irr_counts = simulation.histogram(result['irr'] * 100)
+        fig_irr = px.bar(x=irr_centers, y=irr_counts, labels={'x': 'IRR (%)', 'y': 'Scenarios'}, title="IRR Distribution")
+        fig_irr.update_traces(marker_line_width=0)
+        fig_irr.update_layout(bargap=0)
+        st.plotly_chart(fig_irr, use_container_width=True)
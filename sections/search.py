@@ -0,0 +1,31 @@
+import streamlit as st
+import pandas as pd
+
+import search
+
+# Results for the sidebar's global search box; app.py renders this page instead of the
+# selected section while the box has text in it
+
+KIND_LABELS = {kind: label for kind, label, _, _ in search.SOURCES}
+
+
+def search_page():
+    search_text = st.session_state.get('global_search', "")
+    st.title("Search")
+
+    if not search.ensure_index():
+        st.warning("Search is unavailable: this SQLite build has no full-text search (FTS5).")
+        return
+
+    hits = search.search(search_text)
+    if not hits:
+        st.info(f"Nothing matches \"{search_text}\". Clear the search box to go back to the selected section.")
+        return
+
+    hits_df = pd.DataFrame(hits, columns=search.SEARCH_COLUMNS)
+    hits_df['kind'] = hits_df['kind'].map(KIND_LABELS)
+    hits_df = hits_df[['kind', 'project_name', 'snippet', 'id']].rename(columns={
+        'kind': 'Type', 'project_name': 'Project Name', 'snippet': 'Match', 'id': 'id'
+    })
+    st.caption(f"Best {len(hits_df)} matches for \"{search_text}\" across all projects, most relevant first.")
+    st.dataframe(hits_df, hide_index=True, use_container_width=True)
@@ -0,0 +1,217 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import figure_cache
+import paging
+from db import engine, metadata, named_select
+from sections.common import select_project
+from sections.forms import save_row
+
+# Engine behind the per-project table pages (budget, costs, risks, tasks, issues, ...). A
+# page is a TablePage spec: its table, the columns shown and their headings, the form
+# widgets that add a row and the charts. Every page shares one read and write path: only
+# the listed columns are selected, reads are cached on the table's version so reruns that
+# don't change the data don't query, charts are built once per version through
+# figure_cache, and new rows go through save_row() and the write-behind queue.
+#
+# Widgets are (Streamlit function, label, keyword arguments), e.g.
+# ('selectbox', "Status", {'options': STATUSES}). Charts are (plotly.express function,
+# keyword arguments), drawn from a DataFrame with the headings as its columns.
+#
+# With paged=True the rows are shown as a server-side paginated table with optional
+# filters and search, for tables that grow large; charts are then drawn from the current
+# page, and count_charts from row counts of the whole project grouped by count_columns.
+
+
+# version only keys the cache; a new row changes the table's version
+@st.cache_data(max_entries=32)
+def load_rows(version, table_name, column_names, project_id):
+    table = metadata.tables[table_name]
+    with engine.connect() as conn:
+        return conn.execute(named_select(table, column_names).where(table.c.project_id == project_id)).fetchall()
+
+
+@st.cache_data(max_entries=32)
+def load_counts(version, table_name, project_id, column_names):
+    table = metadata.tables[table_name]
+    return paging.group_counts(table, paging.build_conditions(table, project_id), column_names)
+
+
+@st.cache_data(max_entries=64)
+def load_row_count(version, table_name, project_id, equals=(), search=(None, None)):
+    table = metadata.tables[table_name]
+    return paging.count_rows(table, paging.build_conditions(table, project_id, dict(equals), *search))
+
+
+@st.cache_data(max_entries=64)
+def load_page(version, table_name, column_names, project_id, equals, search, sort_column, descending, page_size, cursor):
+    table = metadata.tables[table_name]
+    conditions = paging.build_conditions(table, project_id, dict(equals), *search)
+    rows = paging.fetch_page(table, conditions, sort_column, descending, page_size, cursor, column_names)
+    return [tuple(row) for row in rows]
+
+
+def draw_charts(charts, frame):
+    return {position: getattr(px, kind)(frame, **options) for position, (kind, options) in enumerate(charts)}
+
+
+class TablePage:
+    # columns maps table columns to headings, in display order, after id and the project
+    # name; fields maps the columns the form sets to widgets; computed maps further columns
+    # to functions of the submitted values. filters maps a column to (label, options) and
+    # search is (column, label), both for paged pages. footer(project_id) draws anything
+    # the page shows below the table.
+    def __init__(self, table, title, item, columns, fields, data_title, file_name, empty_message,
+                 computed=None, charts=(), paged=False, filters=None, search=None,
+                 count_columns=(), count_charts=(), footer=None):
+        self.table = table
+        self.title = title
+        self.item = item
+        self.headings = {'id': 'id', 'project_id': 'Project Name', **columns}
+        self.column_names = tuple(self.headings)
+        self.fields = fields
+        self.computed = computed or {}
+        self.data_title = data_title
+        self.file_name = file_name
+        self.empty_message = empty_message
+        self.charts = charts
+        self.paged = paged
+        self.filters = filters or {}
+        self.search = search
+        self.count_columns = tuple(count_columns)
+        self.count_charts = count_charts
+        self.footer = footer
+
+    def __call__(self):
+        st.title(self.title)
+
+        project_id = select_project()
+        # With no projects yet there is nothing to add rows to; querying for a None
+        # project_id would list rows that aren't linked to any project
+        if project_id is None:
+            st.info("No projects to display. Please add a project.")
+            return
+        self.add_form(project_id)
+
+        version = figure_cache.table_version(self.table)
+        if self.paged:
+            self.paged_view(version, project_id)
+        else:
+            self.full_view(version, project_id)
+
+        if self.footer:
+            self.footer(project_id)
+
+    def add_form(self, project_id):
+        with st.form(f"add_{self.table.name}_form"):
+            st.subheader(f"Add New {self.item}")
+            values = {name: getattr(st, widget)(label, **options) for name, (widget, label, options) in self.fields.items()}
+            submitted = st.form_submit_button(f"Add {self.item}")
+            if submitted:
+                values['project_id'] = project_id
+                for name, compute in self.computed.items():
+                    values[name] = compute(values)
+                first_word, *other_words = self.item.split()
+                message = " ".join([first_word] + [word.lower() for word in other_words])
+                save_row(self.table, values, f"{message} added successfully!")
+
+    def show_figures(self, key, charts, frame):
+        figures = figure_cache.figures.get_or_build(key, lambda: draw_charts(charts, frame))
+        for position in range(len(charts)):
+            st.plotly_chart(figures[position], use_container_width=True)
+
+    # Every row of the project, for tables that stay small per project
+    def full_view(self, version, project_id):
+        rows = load_rows(version, self.table.name, self.column_names, project_id)
+        frame = pd.DataFrame(rows, columns=list(self.headings.values()))
+        if frame.empty:
+            st.info(self.empty_message)
+            return
+
+        self.show_figures((self.table.name, version, project_id), self.charts, frame)
+
+        st.subheader(self.data_title)
+        st.dataframe(frame)
+        st.download_button(
+            label=f"Download {self.data_title}",
+            data=frame.to_csv(index=False),
+            file_name=self.file_name,
+            mime="text/csv"
+        )
+
+    def paged_view(self, version, project_id):
+        if not load_row_count(version, self.table.name, project_id):
+            st.info(self.empty_message)
+            return
+
+        if self.count_charts:
+            counts = load_counts(version, self.table.name, project_id, self.count_columns)
+            counts_frame = pd.DataFrame(counts, columns=[self.headings[name] for name in self.count_columns] + ['Count'])
+            self.show_figures((self.table.name, 'counts', version, project_id), self.count_charts, counts_frame)
+
+        st.subheader(self.data_title)
+        page_frame, page = self.paginated_table(version, project_id)
+        if self.charts and not page_frame.empty:
+            self.show_figures((self.table.name, 'page', version, page), self.charts, page_frame)
+
+    # Paginated, sortable view of the project's rows. Filters and sorting run in SQL and
+    # only the current page is fetched; returns the page as a DataFrame, with the query
+    # and cursor that identify it.
+    def paginated_table(self, version, project_id):
+        key = self.table.name
+        filter_columns = st.columns(len(self.filters) + (1 if self.search else 0) or 1)
+        equals = {}
+        for widget_column, (name, (label, options)) in zip(filter_columns, self.filters.items()):
+            choice = widget_column.selectbox(label, ["All"] + options, key=f"{key}_filter_{name}")
+            equals[name] = None if choice == "All" else choice
+        search = (None, None)
+        if self.search:
+            search = (self.search[0], filter_columns[-1].text_input(self.search[1], key=f"{key}_search"))
+
+        sort_column, order_column, size_column = st.columns(3)
+        # Rows carry the project's name in place of its id, and every row on the page shares it
+        sortable = {heading: name for name, heading in self.headings.items() if name != 'project_id'}
+        sort_name = sortable[sort_column.selectbox("Sort By", list(sortable), key=f"{key}_sort")]
+        descending = order_column.checkbox("Descending", key=f"{key}_descending")
+        page_size = size_column.selectbox("Rows per Page", paging.PAGE_SIZES, key=f"{key}_page_size")
+
+        # Start again from the first page whenever the query itself changes
+        cursors_key = f"{key}_cursors"
+        query_key = f"{key}_query"
+        equals = tuple(equals.items())
+        query = (project_id, equals, search, sort_name, descending, page_size)
+        if st.session_state.get(query_key) != query:
+            st.session_state[query_key] = query
+            st.session_state[cursors_key] = [None]
+        cursors = st.session_state[cursors_key]
+
+        total_rows = load_row_count(version, self.table.name, project_id, equals, search)
+        rows = load_page(version, self.table.name, self.column_names, project_id, equals, search, sort_name, descending, page_size, cursors[-1])
+        page_frame = pd.DataFrame(rows, columns=list(self.headings.values()))
+
+        def next_page():
+            last = rows[-1]
+            st.session_state[cursors_key].append((last[self.column_names.index(sort_name)], last[0]))
+
+        def previous_page():
+            st.session_state[cursors_key].pop()
+
+        page_number = len(cursors)
+        page_count = max((total_rows + page_size - 1) // page_size, 1)
+        st.dataframe(page_frame, hide_index=True)
+        previous_column, info_column, next_column = st.columns([1, 3, 1])
+        previous_column.button("Previous", key=f"{key}_previous", on_click=previous_page, disabled=page_number == 1)
+        info_column.write(f"Page {page_number} of {page_count} ({total_rows} rows)")
+        next_column.button("Next", key=f"{key}_next", on_click=next_page, disabled=page_number >= page_count)
+
+        if st.button("Prepare Download", key=f"{key}_export"):
+            conditions = paging.build_conditions(self.table, project_id, dict(equals), *search)
+            st.download_button(
+                label="Download Filtered Data",
+                data=paging.export_csv(self.table, conditions, list(self.headings.values()), self.column_names),
+                file_name=self.file_name,
+                mime="text/csv"
+            )
+
+        return page_frame, (query, cursors[-1])
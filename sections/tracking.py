@@ -0,0 +1,68 @@
+from db import issues_table, todos_table, calendar_table
+from sections.table_page import TablePage
+
+
+issue_management = TablePage(
+    issues_table,
+    title="Issue Management",
+    item="Issue",
+    columns={'description': 'Description', 'priority': 'Priority', 'status': 'Status'},
+    fields={
+        'description': ('text_area', "Issue Description", {}),
+        'priority': ('selectbox', "Priority", {'options': ["Low", "Medium", "High"]}),
+        'status': ('selectbox', "Status", {'options': ["Open", "Closed"]}),
+    },
+    paged=True,
+    filters={'priority': ("Priority", ["Low", "Medium", "High"]), 'status': ("Status", ["Open", "Closed"])},
+    search=('description', "Search Descriptions"),
+    count_columns=['priority', 'status'],
+    count_charts=[
+        ('bar', {'x': 'Priority', 'y': 'Count', 'color': 'Status', 'title': "Issues by Priority and Status"}),
+        ('pie', {'names': 'Priority', 'values': 'Count', 'title': "Issues Distribution by Priority"}),
+        ('sunburst', {'path': ['Priority', 'Status'], 'values': 'Count', 'title': "Issues Sunburst Chart"}),
+    ],
+    data_title="Issue Data",
+    file_name="issue_data.csv",
+    empty_message="No issues to display for this project. Please add an issue."
+)
+
+
+todo_list = TablePage(
+    todos_table,
+    title="To-Do List",
+    item="To-Do Item",
+    columns={'task': 'Task', 'priority': 'Priority', 'status': 'Status', 'due_date': 'Due Date'},
+    fields={
+        'task': ('text_input', "Task", {}),
+        'priority': ('selectbox', "Priority", {'options': ["High", "Medium", "Low"]}),
+        'status': ('selectbox', "Status", {'options': ["Not Started", "In Progress", "Completed"]}),
+        'due_date': ('date_input', "Due Date", {}),
+    },
+    paged=True,
+    filters={'priority': ("Priority", ["High", "Medium", "Low"]), 'status': ("Status", ["Not Started", "In Progress", "Completed"])},
+    search=('task', "Search Tasks"),
+    charts=[
+        ('bar', {'x': 'Task', 'y': 'Priority', 'color': 'Status', 'title': "To-Do List by Priority and Status (current page)"}),
+    ],
+    data_title="To-Do List",
+    file_name="todo_data.csv",
+    empty_message="No to-do items to display for this project. Please add a to-do item."
+)
+
+
+project_calendar = TablePage(
+    calendar_table,
+    title="Project Calendar",
+    item="Calendar Entry",
+    columns={'event_name': 'Event Name', 'event_date': 'Event Date'},
+    fields={
+        'event_name': ('text_input', "Event Name", {}),
+        'event_date': ('date_input', "Event Date", {}),
+    },
+    charts=[
+        ('timeline', {'x_start': "Event Date", 'x_end': "Event Date", 'y': "Event Name", 'title': "Project Calendar"}),
+    ],
+    data_title="Project Calendar",
+    file_name="calendar_data.csv",
+    empty_message="No calendar entries to display for this project. Please add a calendar entry."
+)
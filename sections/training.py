@@ -0,0 +1,95 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from sections.common import session
+
+
+def job_description():
+    st.title("Job Description: Assistant Manager Business Transformation")
+
+    st.header("Job Summary")
+    st.write("Seeking a highly motivated and results-oriented Business Transformation Assistant Manager to play a pivotal role in leading the digitization and turnaround initiatives of our organization. You will be responsible for identifying and implementing strategic solutions that optimize processes, enhance efficiency, and ultimately drive sustainable growth.")
+
+    st.header("Main Tasks")
+
+    tasks = [
+        ("Develop and execute comprehensive digitization plans", "Analyze current business processes and identify opportunities for automation and digital transformation."),
+        ("Research and evaluate emerging technologies", "Research and evaluate emerging technologies with a focus on their potential impact on the organization."),
+        ("Develop and implement a roadmap for digitization", "Develop and implement a roadmap for digitization prioritizing initiatives based on feasibility, impact, and return on investment (ROI)."),
+        ("Lead turnaround projects", "Collaborate with cross-functional teams to identify and address critical areas impacting business performance."),
+        ("Develop and implement turnaround plans", "Develop and implement turnaround plans encompassing cost optimization, revenue generation strategies, and process improvements."),
+        ("Track progress", "Track progress, measure results, and ensure that project objectives are met within budget and timelines."),
+        ("Champion a culture of continuous improvement", "Champion a culture of continuous improvement within the organization."),
+        ("Develop and implement communication strategies", "Develop and implement effective communication strategies to ensure all stakeholders are informed and engaged throughout the transformation process."),
+        ("Lead training initiatives", "Lead training initiatives to equip employees with the skills and knowledge necessary to adapt to new processes and technologies."),
+        ("Develop and implement KPIs", "Develop and implement key performance indicators (KPIs) to track the progress and success of digitization and turnaround initiatives."),
+        ("Monitor and analyze performance data", "Regularly monitor and analyze performance data, identifying areas for further improvement."),
+        ("Prepare comprehensive reports", "Prepare comprehensive reports to keep senior management informed of project progress and overall business transformation efforts.")
+    ]
+
+    with st.form("add_task_form"):
+        task = st.selectbox("Task", [t[0] for t in tasks])
+        description = st.text_area("Description", value=[t[1] for t in tasks if t[0] == task][0])
+        confirmation = st.selectbox("Confirmation of accuracy of Allocated task", ["Not Confirmed", "Confirmed"])
+        remarks = st.text_area("Remarks")
+        submitted = st.form_submit_button("Add Task")
+        if submitted:
+            new_task = pd.DataFrame({
+                'Project Name': [selected_project_name],
+                'Task': [task],
+                'Description': [description],
+                'Confirmation': [confirmation],
+                'Remarks': [remarks]
+            })
+            st.session_state['jd_data'] = pd.concat([st.session_state['jd_data'], new_task], ignore_index=True)
+            st.success("Task added successfully!")
+
+    st.subheader("Tasks Data")
+    task_df = st.session_state['jd_data']
+    st.dataframe(task_df)
+
+    if not task_df.empty:
+        fig_confirmation = px.pie(task_df, names='Confirmation', title="Task Confirmation Status")
+        st.plotly_chart(fig_confirmation, use_container_width=True)
+
+
+def training_and_development():
+    st.title("Training and Development")
+
+    with st.form("add_training_form"):
+        st.subheader("Add New Training Program")
+        program_name = st.text_input("Program Name")
+        trainer = st.text_input("Trainer")
+        start_date = st.date_input("Start Date")
+        end_date = st.date_input("End Date")
+        status = st.selectbox("Status", ["Planned", "In Progress", "Completed"])
+        submitted = st.form_submit_button("Add Training Program")
+        if submitted:
+            new_training = {
+                'program_name': program_name,
+                'trainer': trainer,
+                'start_date': start_date,
+                'end_date': end_date,
+                'status': status
+            }
+            session.execute(training_table.insert().values(new_training))
+            session.commit()
+            st.success("Training program added successfully!")
+
+    training = session.execute(training_table.select()).fetchall()
+    training_df = pd.DataFrame(training, columns=['id', 'Program Name', 'Trainer', 'Start Date', 'End Date', 'Status'])
+    if not training_df.empty:
+        st.subheader("Training Programs Data")
+        st.dataframe(training_df)
+
+        fig_training = px.bar(training_df, x='Program Name', y='Status', color='Status', title="Training Programs Status")
+        st.plotly_chart(fig_training, use_container_width=True)
+        st.download_button(
+            label="Download Training Data",
+            data=training_df.to_csv(index=False),
+            file_name="training_data.csv",
+            mime="text/csv"
+        )
+    else:
+        st.info("No training programs to display. Please add a training program.")
@@ -0,0 +1,113 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+import finance
+
+# Monte Carlo ROI simulation. Each year's cash flow is sampled independently from either
+# a normal distribution (mean, std dev) or a triangular one (low, mode, high); NPV and IRR
+# are then computed for every scenario at once with the vectorised helpers in finance.py.
+# Large runs are split into chunks that run on a shared process pool.
+
+DISTRIBUTIONS = ['Normal', 'Triangular']
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+# Runs smaller than this are computed in-process; the pool only pays off above it
+PARALLEL_THRESHOLD = 20000
+SCENARIOS_PER_CHUNK = 25000
+
+_executor = None
+
+
+# One pool per process, created on first use and reused by every later simulation.
+# "spawn" keeps workers independent of the threads Streamlit is running.
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+
+def reset_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+def sample_cash_flows(rng, scenarios, initial_investment, distribution, parameters):
+    parameters = np.asarray(parameters, dtype=float)
+    if distribution == 'Normal':
+        means, stds = parameters[:, 0], parameters[:, 1]
+        flows = rng.normal(means, stds, size=(scenarios, len(parameters)))
+    elif distribution == 'Triangular':
+        lows, modes, highs = parameters[:, 0], parameters[:, 1], parameters[:, 2]
+        flows = rng.triangular(lows, modes, highs, size=(scenarios, len(parameters)))
+    else:
+        raise ValueError(f"Unknown distribution '{distribution}'")
+    return np.column_stack([np.full(scenarios, -float(initial_investment)), flows])
+
+
+def _simulate_chunk(seed, scenarios, initial_investment, distribution, parameters, discount_rate):
+    rng = np.random.default_rng(seed)
+    cash_flows = sample_cash_flows(rng, scenarios, initial_investment, distribution, parameters)
+    return (
+        finance.npv(discount_rate, cash_flows),
+        finance.irr(cash_flows),
+        finance.roi(cash_flows),
+    )
+
+
+def _summary(values):
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return {'mean': np.nan, 'std': np.nan, **{f'P{p}': np.nan for p in PERCENTILES}}
+    return {
+        'mean': finite.mean(),
+        'std': finite.std(),
+        **dict(zip([f'P{p}' for p in PERCENTILES], np.percentile(finite, PERCENTILES))),
+    }
+
+
+# parameters has one row per year: (mean, std dev) for Normal or (low, mode, high) for Triangular
+def run_simulation(initial_investment, distribution, parameters, scenarios=100000, discount_rate=0.1, seed=None, parallel=True):
+    chunk_sizes = [SCENARIOS_PER_CHUNK] * (scenarios // SCENARIOS_PER_CHUNK)
+    if scenarios % SCENARIOS_PER_CHUNK:
+        chunk_sizes.append(scenarios % SCENARIOS_PER_CHUNK)
+    # Independent, reproducible streams per chunk, so results don't depend on the pool size
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    arguments = [(chunk_seed, size, initial_investment, distribution, parameters, discount_rate) for chunk_seed, size in zip(seeds, chunk_sizes)]
+
+    results = None
+    if parallel and scenarios >= PARALLEL_THRESHOLD:
+        try:
+            futures = [get_executor().submit(_simulate_chunk, *chunk_arguments) for chunk_arguments in arguments]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A dead worker poisons the whole pool; drop it and finish in-process
+            reset_executor()
+    if results is None:
+        results = [_simulate_chunk(*chunk_arguments) for chunk_arguments in arguments]
+
+    npv, irr, roi = (np.concatenate(values) for values in zip(*results))
+    return {
+        'scenarios': scenarios,
+        'npv': npv,
+        'irr': irr,
+        'roi': roi,
+        'npv_summary': _summary(npv),
+        'irr_summary': _summary(irr),
+        'roi_summary': _summary(roi),
+        'probability_positive_npv': float((npv > 0).mean()),
+        'irr_undefined': int(np.isnan(irr).sum()),
+    }
+
+
+# Histogram bins computed here so the browser receives ~100 bars rather than every scenario
+def histogram(values, bins=100):
+    finite = values[np.isfinite(values)]
+    counts, edges = np.histogram(finite, bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts
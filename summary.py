@@ -0,0 +1,201 @@
+import threading
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+import history
+from db import (
+    engine, projects_table, tasks_table, risks_table, budget_table, resources_table,
+    issues_table, milestones_table, costs_table, todos_table, cost_estimations_table,
+    project_summary_table
+)
+
+# Materialised per-project summary, keyed on project_id. Each rule below says how rows of a source table feed
+# one project_summary column; the same rules drive the incremental upsert applied with
+# every insert and the full rebuild used to backfill an existing database.
+#
+# Rule: (summary column, aggregate, source column, conditions) where aggregate is
+# 'count', 'sum', 'max' or 'set' (copy the latest value) and conditions is a dict of
+# source column -> required value, or None for every row.
+SUMMARY_RULES = {
+    'tasks': [
+        ('tasks', 'count', None, None),
+        ('tasks_not_started', 'count', None, {'status': "Not Started"}),
+        ('tasks_in_progress', 'count', None, {'status': "In Progress"}),
+        ('tasks_completed', 'count', None, {'status': "Completed"}),
+    ],
+    'issues': [
+        ('issues', 'count', None, None),
+        ('open_issues', 'count', None, {'status': "Open"}),
+        ('high_priority_open_issues', 'count', None, {'status': "Open", 'priority': "High"}),
+    ],
+    'risks': [
+        ('risks', 'count', None, None),
+        ('open_risks', 'count', None, {'status': "Open"}),
+        ('open_risk_exposure', 'sum', 'severity', {'status': "Open"}),
+        ('max_open_severity', 'max', 'severity', {'status': "Open"}),
+    ],
+    'budget': [
+        ('budget_allocated', 'sum', 'allocated', None),
+        ('budget_lines_spent', 'sum', 'spent', None),
+    ],
+    'costs': [
+        ('planned_cost', 'sum', 'planned_cost', None),
+        ('actual_cost', 'sum', 'actual_cost', None),
+    ],
+    'resources': [
+        ('resources', 'count', None, None),
+        ('resource_allocation', 'sum', 'allocation', None),
+    ],
+    'milestones': [
+        ('milestones', 'count', None, None),
+        ('milestones_completed', 'count', None, {'status': "Completed"}),
+    ],
+    'todos': [
+        ('todos', 'count', None, None),
+        ('todos_completed', 'count', None, {'status': "Completed"}),
+    ],
+    'cost_estimations': [
+        ('estimated_cost', 'sum', 'estimated_cost', None),
+    ],
+}
+
+SOURCE_TABLES = {
+    'tasks': tasks_table,
+    'issues': issues_table,
+    'risks': risks_table,
+    'budget': budget_table,
+    'costs': costs_table,
+    'resources': resources_table,
+    'milestones': milestones_table,
+    'todos': todos_table,
+    'cost_estimations': cost_estimations_table,
+}
+
+_build_lock = threading.Lock()
+
+
+def _upsert(executor, table_name, deltas):
+    if not deltas:
+        return
+    summary = project_summary_table.c
+    statement = insert(project_summary_table)
+    excluded = statement.excluded
+    updates = {}
+    for column, aggregate, _, _ in SUMMARY_RULES[table_name]:
+        if aggregate in ('count', 'sum'):
+            updates[column] = func.coalesce(summary[column], 0) + excluded[column]
+        elif aggregate == 'max':
+            updates[column] = func.max(func.coalesce(summary[column], excluded[column]), func.coalesce(excluded[column], summary[column]))
+        else:
+            updates[column] = func.coalesce(excluded[column], summary[column])
+    statement = statement.on_conflict_do_update(index_elements=['project_id'], set_=updates)
+    executor.execute(statement, list(deltas.values()))
+
+
+# Summary deltas for newly inserted rows, keyed on project_id. Rows without a project are
+# left out, as in rebuild(); a None key would otherwise take an auto-assigned project_id
+# and be credited to some other project.
+def _deltas(rules, records):
+    deltas = {}
+    for record in records:
+        project_id = record.get('project_id')
+        if project_id is None:
+            continue
+        delta = deltas.get(project_id)
+        if delta is None:
+            delta = deltas[project_id] = {'project_id': project_id}
+            for column, aggregate, _, _ in rules:
+                delta[column] = 0 if aggregate in ('count', 'sum') else None
+        for column, aggregate, source, conditions in rules:
+            if conditions and any(record.get(name) != value for name, value in conditions.items()):
+                continue
+            value = record.get(source) if source else None
+            if aggregate == 'count':
+                delta[column] += 1
+            elif value is None:
+                continue
+            elif aggregate == 'sum':
+                delta[column] += value
+            elif aggregate == 'max':
+                delta[column] = value if delta[column] is None else max(delta[column], value)
+            else:
+                delta[column] = value
+    return deltas
+
+
+# Fold newly inserted rows into project_summary and the snapshot history. Call with the
+# session or connection that did the insert, before it commits, so neither can disagree
+# with the source. Rows of projects itself carry their new id as project_id.
+def apply_records(executor, table, records):
+    rules = SUMMARY_RULES.get(table.name)
+    if rules:
+        _upsert(executor, table.name, _deltas(rules, records))
+    history.record(executor, table, records)
+
+
+# Insert rows and apply them, in the caller's transaction. New projects' ids come back
+# through RETURNING so their budget and spend enter the history the day they are added.
+def insert_records(executor, table, records):
+    if table is projects_table:
+        statement = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+        project_ids = executor.execute(statement, records).scalars().all()
+        records = [{**record, 'project_id': project_id} for record, project_id in zip(records, project_ids)]
+    else:
+        executor.execute(table.insert(), records)
+    apply_records(executor, table, records)
+
+
+def _aggregate(table, aggregate, source, conditions):
+    condition = and_(*[table.c[name] == value for name, value in conditions.items()]) if conditions else None
+    if aggregate == 'count':
+        return func.count() if condition is None else func.sum(case((condition, 1), else_=0))
+    value = table.c[source] if condition is None else case((condition, table.c[source]))
+    if aggregate == 'sum':
+        return func.coalesce(func.sum(value), 0)
+    if aggregate == 'max':
+        return func.max(value)
+    raise ValueError(f"'{aggregate}' rules are rebuilt from the rows themselves")
+
+
+# Recompute project_summary from the source tables, in one transaction
+def rebuild(bind=engine):
+    with bind.begin() as conn:
+        conn.execute(project_summary_table.delete())
+        for table_name, rules in SUMMARY_RULES.items():
+            table = SOURCE_TABLES[table_name]
+            columns = [_aggregate(table, aggregate, source, conditions).label(column) for column, aggregate, source, conditions in rules]
+            rows = conn.execute(
+                select(table.c.project_id, *columns).where(table.c.project_id.is_not(None)).group_by(table.c.project_id)
+            ).mappings().fetchall()
+            _upsert(conn, table_name, {row['project_id']: dict(row) for row in rows})
+
+
+# Backfill the summary once for databases that predate it
+def ensure_built(bind=engine):
+    with _build_lock:
+        with bind.connect() as conn:
+            if conn.execute(select(project_summary_table.c.project_id).limit(1)).first():
+                return
+            if not conn.execute(select(projects_table.c.id).limit(1)).first():
+                return
+        rebuild(bind)
+
+
+# Columns of load_summary() rows: the project's own fields, then the aggregates
+SUMMARY_COLUMNS = ['project_id', 'project_name', 'portfolio', 'status', 'budget', 'spent'] + [
+    column.name for column in project_summary_table.columns if column.name != 'project_id'
+]
+
+
+# One row per project, including projects nothing has been recorded against yet
+def load_summary(bind=engine):
+    project = projects_table.c
+    aggregates = [column for column in project_summary_table.columns if column.name != 'project_id']
+    query = (
+        select(project.id, project.name.label('project_name'), project.portfolio, project.status, project.budget, project.spent, *aggregates)
+        .select_from(projects_table.outerjoin(project_summary_table, project_summary_table.c.project_id == project.id))
+        .order_by(project.name, project.id)
+    )
+    with bind.connect() as conn:
+        return conn.execute(query).fetchall()
@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+# The app's modules bind their engine at import, so point them at a throwaway database
+# before any test imports them
+os.environ.setdefault("BT_DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from db import init_schema, make_engine  # noqa: E402
+
+
+# A fresh database per test
+@pytest.fixture
+def bind(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    init_schema(engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,42 @@
+import io
+
+import pandas as pd
+from PIL import Image
+
+import chart_render
+import figure_cache
+import pdf_report
+from sections.common import project_overview_figures
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), 'white').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_second_presentation_renders_nothing(bind, monkeypatch):
+    renders = []
+    monkeypatch.setattr(chart_render, '_render', lambda figure: renders.append(figure) or png_bytes())
+    monkeypatch.setattr(chart_render, 'pngs', chart_render.PngCache())
+    monkeypatch.setattr(figure_cache, 'figures', figure_cache.FigureCache())
+    project_df = pd.DataFrame({
+        'Project Name': ["Alpha", "Beta"],
+        'Start Date': pd.to_datetime(["2024-01-01", "2024-03-01"]),
+        'End Date': pd.to_datetime(["2024-06-30", "2024-12-31"]),
+        'Budget': [1000.0, 2500.0],
+        'Spent': [400.0, 2600.0],
+        'Status': ["In Progress", "Completed"],
+    })
+
+    # As the Make Presentation page does: figures from figure_cache, then PNGs
+    def build_pdf():
+        charts = chart_render.render_pngs(project_overview_figures(('projects', 2, 2), project_df))
+        return pdf_report.build_presentation(charts, bind=bind)
+
+    first = build_pdf()
+    assert len(renders) == 4
+    second = build_pdf()
+    assert len(renders) == 4
+    assert chart_render.pngs.hits == 4
+    assert first.startswith(b'%PDF') and second.startswith(b'%PDF')
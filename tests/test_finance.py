@@ -0,0 +1,39 @@
+import numpy as np
+import numpy_financial as npf
+
+import finance
+
+
+def assert_matches_npf(matrix):
+    expected = np.array([npf.irr(row) for row in matrix])
+    np.testing.assert_allclose(finance.irr(matrix), expected, rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+def test_irr_multiple_sign_changes():
+    # Roots at 10% and 20%; numpy_financial picks the one nearest 0%
+    assert np.isclose(finance.irr([[-100, 230, -132]])[0], 0.10)
+    assert_matches_npf(np.array([
+        [-100, 230, -132, 0, 0],
+        [-1000, 3600, -4310, 1716, 0],
+        [100, -250, 180, -20, 0],
+        [-50, 120, -80, 30, -25],
+    ], dtype=float))
+
+
+def test_irr_matches_npf_on_random_multi_sign_series():
+    rng = np.random.default_rng(7)
+    for periods in range(2, 10):
+        matrix = rng.normal(0, 100, (400, periods))
+        # Zero flows at the start, middle and end of series
+        matrix[rng.random(matrix.shape) < 0.2] = 0
+        assert_matches_npf(matrix)
+
+
+def test_irr_without_a_root_is_nan():
+    rates = finance.irr([[0, 0, 0], [100, 50, 25], [-100, 0, 0], [0, 0, 0.0]])
+    assert np.isnan(rates).all()
+
+
+def test_irr_ignores_zero_padding():
+    rates = finance.irr([[-100, 110, 0, 0], [0, -100, 110, 0]])
+    assert np.allclose(rates, 0.10)
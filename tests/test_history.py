@@ -0,0 +1,37 @@
+import datetime
+import io
+
+from sqlalchemy import select
+
+import bulk_import
+import history
+from db import projects_table, tasks_table
+from write_queue import WriteBehindQueue
+
+
+def budget_today(bind):
+    today = datetime.date.today()
+    return history.load_history(today, today, bind=bind).loc[:, 'budget'].iloc[0]
+
+
+def test_projects_added_through_the_write_queue_enter_the_history(bind):
+    queue = WriteBehindQueue(bind)
+    futures = [queue.submit(projects_table, {'name': name, 'budget': budget}) for name, budget in [("A", 100.0), ("B", 50.0)]]
+    for future in futures:
+        future.result(timeout=10)
+    assert budget_today(bind) == 150
+
+    # A later task doesn't move the budget
+    with bind.connect() as conn:
+        project_id = conn.execute(select(projects_table.c.id).where(projects_table.c.name == "B")).scalar()
+    queue.submit(tasks_table, {'project_id': project_id, 'task': "Plan", 'status': "Completed"}).result(timeout=10)
+    queue.close()
+    assert budget_today(bind) == 150
+
+
+def test_imported_projects_enter_the_history(bind):
+    report = bulk_import.import_file(io.StringIO("name,budget,spent\nA,100,10\nB,50,5\n"), 'projects', 'csv', bind=bind)
+    assert report['rows_inserted'] == 2
+    today = datetime.date.today()
+    levels = history.load_history(today, today, bind=bind).iloc[0]
+    assert (levels['budget'], levels['spent']) == (150, 15)
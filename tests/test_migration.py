@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+import search
+from db import drop_legacy_project_names, init_schema, make_engine, unmatched_project_names, issues_table, tasks_table
+
+# Tables as databases from before project_id (such as the shipped jayjay_bt_app.db)
+# created them; init_schema() creates every other table
+LEGACY_SCHEMA = [
+    "CREATE TABLE projects (id INTEGER NOT NULL, name VARCHAR, start_date DATE, end_date DATE, budget FLOAT, "
+    "spent FLOAT, status VARCHAR, portfolio VARCHAR, impact FLOAT, deliverable VARCHAR, timeline VARCHAR, PRIMARY KEY (id))",
+    "CREATE TABLE tasks (id INTEGER NOT NULL, project_name VARCHAR, task VARCHAR, priority VARCHAR, status VARCHAR, "
+    "start_date DATE, end_date DATE, PRIMARY KEY (id))",
+    "CREATE INDEX ix_tasks_project_name ON tasks (project_name)",
+    "CREATE TABLE issues (id INTEGER NOT NULL, project_name VARCHAR, description VARCHAR, priority VARCHAR, "
+    "status VARCHAR, PRIMARY KEY (id))",
+]
+
+
+@pytest.fixture
+def legacy(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql("INSERT INTO projects (id, name) VALUES (1, 'Alpha'), (2, 'Beta'), (3, 'Alpha')")
+        conn.exec_driver_sql(
+            "INSERT INTO tasks (id, project_name, task) VALUES "
+            "(1, 'Alpha', 'Plan rollout'), (2, 'Beta', 'Train staff'), (3, 'Ghost', 'Orphaned work'), (4, NULL, 'No project')"
+        )
+        conn.exec_driver_sql("INSERT INTO issues (id, project_name, description) VALUES (1, 'Beta', 'Vendor delay')")
+    yield engine
+    engine.dispose()
+
+
+def project_ids(bind, table):
+    with bind.connect() as conn:
+        return dict(conn.execute(select(table.c.id, table.c.project_id)).fetchall())
+
+
+def columns(bind, table_name):
+    with bind.connect() as conn:
+        return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table_name})")}
+
+
+def test_init_schema_links_rows_by_id(legacy):
+    init_schema(legacy)
+
+    # A name used twice resolves to the oldest project; unknown names stay unlinked
+    assert project_ids(legacy, tasks_table) == {1: 1, 2: 2, 3: None, 4: None}
+    assert project_ids(legacy, issues_table) == {1: 2}
+    assert unmatched_project_names(legacy) == {'tasks': 1}
+    # The legacy column stays until it is dropped explicitly
+    assert 'project_name' in columns(legacy, 'tasks')
+
+
+def test_dropping_project_names_keeps_search_and_foreign_keys(legacy):
+    init_schema(legacy)
+    assert search.ensure_index(legacy)
+    with legacy.begin() as conn:
+        conn.execute(tasks_table.delete().where(tasks_table.c.id == 3))
+    assert unmatched_project_names(legacy) == {}
+
+    assert sorted(drop_legacy_project_names(legacy)) == ['issues', 'tasks']
+    assert 'project_name' not in columns(legacy, 'tasks')
+    assert [hit[:3] for hit in search.search("rollout", bind=legacy)] == [('tasks', 1, 1)]
+
+    # The FTS triggers still fire on the rewritten tables
+    with legacy.begin() as conn:
+        conn.execute(tasks_table.insert().values(id=10, project_id=2, task="Migrate reports"))
+        conn.execute(issues_table.update().where(issues_table.c.id == 1).values(description="Supplier delay"))
+    assert [hit[:3] for hit in search.search("reports", project_id=2, bind=legacy)] == [('tasks', 10, 2)]
+    assert [hit[:2] for hit in search.search("supplier", bind=legacy)] == [('issues', 1)]
+    assert search.search("vendor", bind=legacy) == []
+
+    # And project_id is still enforced as a foreign key
+    with legacy.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_key_check").fetchall() == []
+    with pytest.raises(IntegrityError):
+        with legacy.begin() as conn:
+            conn.execute(tasks_table.insert().values(project_id=99, task="Nowhere"))
@@ -0,0 +1,55 @@
+import io
+
+from sqlalchemy import select
+
+import bulk_import
+import summary
+from db import projects_table, project_summary_table, tasks_table
+
+
+def add_projects(bind, *names):
+    with bind.begin() as conn:
+        return [conn.execute(projects_table.insert().values(name=name)).inserted_primary_key[0] for name in names]
+
+
+def summary_rows(bind):
+    with bind.connect() as conn:
+        return dict(conn.execute(select(project_summary_table.c.project_id, project_summary_table.c.tasks)).fetchall())
+
+
+def test_rows_without_a_project_are_not_summarised(bind):
+    first, second = add_projects(bind, "Alpha", "Beta")
+    records = [
+        {'project_id': first, 'task': "Plan", 'status': "Completed"},
+        {'project_id': None, 'task': "Orphan", 'status': "Open"},
+    ]
+    with bind.begin() as conn:
+        conn.execute(tasks_table.insert(), records)
+        summary.apply_records(conn, tasks_table, records)
+    assert summary_rows(bind) == {first: 1}
+
+
+def test_import_rejects_missing_and_unknown_project_ids(bind):
+    first, second = add_projects(bind, "Alpha", "Beta")
+    source = io.StringIO(
+        "project_id,task,status\n"
+        f"{first},Plan,Completed\n"
+        ",Orphan,Open\n"
+        "999,Lost,Open\n"
+        f"{second},Build,Open\n"
+    )
+    report = bulk_import.import_file(source, 'tasks', 'csv', bind=bind)
+
+    assert report['rows_inserted'] == 2
+    assert sorted(report['errors']) == [(2, "missing project_id"), (3, "unknown project_id: '999'")]
+    assert summary_rows(bind) == {first: 1, second: 1}
+
+
+def test_import_by_name_rejects_missing_names(bind):
+    first, = add_projects(bind, "Alpha")
+    source = io.StringIO("project_name,task\nAlpha,Plan\n,Orphan\nGamma,Lost\n")
+    report = bulk_import.import_file(source, 'tasks', 'csv', bind=bind)
+
+    assert report['rows_inserted'] == 1
+    assert sorted(report['errors']) == [(2, "missing project_name"), (3, "unknown project_name: 'Gamma'")]
+    assert summary_rows(bind) == {first: 1}
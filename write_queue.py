@@ -0,0 +1,120 @@
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+import summary
+from db import engine
+
+# Write-behind queue for form submissions. Pages hand rows to one background writer
+# thread instead of committing them on the script thread. The writer takes everything
+# queued so far (up to MAX_BATCH rows, from every session) and inserts it in a single
+# transaction, together with the matching project_summary updates. Under load, many
+# submits share one commit and the writer is the only thread contending for SQLite's
+# write lock. Each submit gets a Future that completes once its row is committed.
+
+MAX_BATCH = 500
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    def __init__(self, bind=engine, max_batch=MAX_BATCH):
+        self.bind = bind
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write queue has been closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+
+    # Queue one row for insertion. on_commit is called (on the writer thread) once the row
+    # is committed; the returned Future resolves to True then, or to the insert's exception.
+    def submit(self, table, values, on_commit=None):
+        future = Future()
+        if on_commit is not None:
+            future.add_done_callback(lambda done: done.exception() is None and on_commit())
+        self._ensure_started()
+        self._queue.put((table, dict(values), future))
+        return future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            # Whatever queued up while the previous batch was being written joins this one
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _insert(self, conn, batch):
+        # executemany needs one statement per table and set of columns
+        groups = {}
+        for table, values, _ in batch:
+            groups.setdefault((table, tuple(sorted(values))), []).append(values)
+        for (table, _), records in groups.items():
+            summary.insert_records(conn, table, records)
+
+    def _write(self, batch):
+        try:
+            with self.bind.begin() as conn:
+                self._insert(conn, batch)
+        except Exception:
+            logger.exception("Batch of %d rows failed; retrying them one at a time", len(batch))
+            # One bad row must not fail everyone else's submit
+            for item in batch:
+                try:
+                    with self.bind.begin() as conn:
+                        self._insert(conn, [item])
+                except Exception as exc:
+                    item[2].set_exception(exc)
+                else:
+                    self._done([item])
+            return
+        self._done(batch)
+
+    def _done(self, batch):
+        self.batches += 1
+        self.rows += len(batch)
+        for _, _, future in batch:
+            future.set_result(True)
+
+    # Write everything already queued, then stop the writer thread
+    def close(self, timeout=None):
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+
+writer = WriteBehindQueue()
+atexit.register(writer.close)